@@ -25,6 +25,7 @@ from .logging.logging_service import (
     LoggingService,
     LogLevel,
     PerformanceLogger,
+    PerformanceAggregator,
     performance_monitor,
     get_logging_service,
     create_logging_service,
@@ -90,6 +91,7 @@ from .external.interfaces import (
 # 监控服务
 from .monitoring import (
     MetricsService,
+    BufferedMetricsService,
     MetricType,
     MetricValue,
     TimeSeriesData,
@@ -184,6 +186,7 @@ __all__ = [
     'LoggingService',
     'LogLevel',
     'PerformanceLogger',
+    'PerformanceAggregator',
     'performance_monitor',
     'get_logging_service',
     'create_logging_service',
@@ -237,6 +240,7 @@ __all__ = [
 
     # 监控服务
     'MetricsService',
+    'BufferedMetricsService',
     'MetricType',
     'MetricValue',
     'TimeSeriesData',
@@ -128,6 +128,11 @@ class CacheService:
 
         self._logger.info(f"缓存服务初始化完成: {strategy.value}, 最大{max_size}项, {max_memory_mb}MB")
 
+    @property
+    def supports_native_objects(self) -> bool:
+        """是否可直接保存任意Python对象（未启用JSON持久化时为纯进程内缓存）"""
+        return self._persistence_path is None
+
     def get(self, key: str) -> Optional[Any]:
         """获取缓存值
 
@@ -251,6 +256,26 @@ class CacheService:
 
             return False
 
+    def touch(self, key: str, ttl: int) -> bool:
+        """延长缓存项的生存时间，确保其至少再存活 ttl 秒
+
+        Args:
+            key: 缓存键
+            ttl: 剩余生存时间（秒）
+
+        Returns:
+            缓存项是否存在
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.is_expired():
+                return False
+
+            if entry.ttl is not None:
+                entry.ttl = max(entry.ttl, int(entry.get_age()) + ttl)
+
+            return True
+
     def clear(self):
         """清空缓存"""
         with self._lock:
@@ -3,20 +3,44 @@
 专门用于缓存RAG查询结果、对话上下文和检索结果
 """
 
-import hashlib
+import atexit
+import json
+import pickle
+import sys
 import threading
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from hashlib import sha256, md5
+from math import log2
+from typing import List, Dict, Any, Optional, Tuple, Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 
+import numpy as np
+
 from .cache_service import CacheService, get_cache_service
+from ..config.configuration_service import get_config_service
 from ..logging.logging_service import get_logging_service, ILoggingService
 from ..monitoring.metrics_service import get_metrics_service
+from ..utilities.dataclass_slots import add_slots
+
+
+# 频率草图的行索引
+_SKETCH_ROWS = np.arange(4)
+
+# 频率草图累计增加该次数后全部计数减半（老化），旧的访问频率逐步衰减
+_SKETCH_SAMPLE_SIZE = 10 * 1024
+
+# 每个线程缓冲的指标条数达到该值时批量提交
+_METRICS_BATCH_SIZE = 128
 
+# 后台定期提交缓冲指标的间隔（秒），低流量线程的样本也能及时可见
+_METRICS_FLUSH_INTERVAL = 1.0
 
-@dataclass
+
+@add_slots
+@dataclass(frozen=True)
 class QueryCacheEntry:
-    """查询缓存条目"""
+    """查询缓存条目（不可变，可在线程间直接共享）"""
     query_hash: str
     original_query: str
     response: str
@@ -24,8 +48,14 @@ class QueryCacheEntry:
     context_used: str
     model_name: str
     response_time: float
-    cached_at: datetime
+    cached_at: float  # Unix时间戳（秒）
     metadata: Dict[str, Any]
+    base_ttl: int = 1800  # 基础生存时间（秒），自适应TTL在此基础上延长
+
+    @property
+    def cached_at_dt(self) -> datetime:
+        """缓存时间（datetime）"""
+        return datetime.fromtimestamp(self.cached_at)
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -37,8 +67,9 @@ class QueryCacheEntry:
             'context_used': self.context_used,
             'model_name': self.model_name,
             'response_time': self.response_time,
-            'cached_at': self.cached_at.isoformat(),
-            'metadata': self.metadata
+            'cached_at': self.cached_at,
+            'metadata': self.metadata,
+            'base_ttl': self.base_ttl
         }
 
 
@@ -47,22 +78,53 @@ class QueryCache:
 
     def __init__(self,
                  cache_service: Optional[CacheService] = None,
-                 logger_service: Optional[ILoggingService] = None):
+                 logger_service: Optional[ILoggingService] = None,
+                 max_semantic_entries: int = 10000,
+                 adaptive_ttl: Optional[bool] = None):
         """初始化查询缓存
 
         Args:
             cache_service: 底层缓存服务
             logger_service: 日志服务
+            max_semantic_entries: 语义缓存最多保留的查询向量数
+            adaptive_ttl: 是否按访问频率自适应TTL，默认读取配置 adaptive_ttl_enabled
         """
         self._cache = cache_service or get_cache_service()
         self._logger = logger_service or get_logging_service()
         self._metrics = get_metrics_service()
         self._lock = threading.RLock()
 
-        # 缓存前缀
-        self._query_prefix = "query:"
-        self._retrieval_prefix = "retrieval:"
-        self._context_prefix = "context:"
+        # 指标按线程缓冲，攒够一批或后台定期提交给指标服务，避免每次调用都争用其锁；
+        # 每个缓冲区为 [锁, 样本列表, 所属线程]，所属线程结束后由提交时清理
+        self._metrics_local = threading.local()
+        self._metrics_buffers: List[List[Any]] = []
+        self._metrics_buffers_lock = threading.Lock()
+        self._metrics_stop = threading.Event()
+        self._metrics_flush_thread: Optional[threading.Thread] = None
+        atexit.register(self._close_metrics)
+
+        # 按键分段的锁和进行中的计算（single-flight），避免相同查询重复生成
+        self._stripes = [threading.Lock() for _ in range(64)]
+        self._inflight: Dict[str, threading.Event] = {}
+
+        # 语义二级缓存：归一化查询向量矩阵（按容量预分配），行号与查询哈希一一对应
+        self._max_semantic_entries = max_semantic_entries
+        self._emb_matrix: Optional[np.ndarray] = None
+        self._emb_keys: List[str] = []
+        self._emb_populated_at: List[float] = []
+
+        # 自适应TTL：用Count-Min草图（4行×1024列）估计每个查询哈希的访问频率
+        if adaptive_ttl is None:
+            adaptive_ttl = get_config_service().get_value("adaptive_ttl_enabled", True)
+        self._adaptive_ttl = bool(adaptive_ttl)
+        self._freq_sketch = np.zeros((4, 1024), dtype=np.uint16)
+        self._sketch_additions = 0
+
+        # 缓存前缀（驻留字符串，键直接拼接生成）
+        self._query_prefix = sys.intern("query:")
+        self._retrieval_prefix = sys.intern("retrieval:")
+        self._context_prefix = sys.intern("context:")
+        self._chunks_prefix = sys.intern("chunks:")
 
         self._logger.info("查询缓存初始化完成")
 
@@ -82,27 +144,28 @@ class QueryCache:
         Returns:
             查询哈希值
         """
-        hasher = hashlib.sha256()
+        # 所有字段拼接到同一缓冲区后一次性哈希，字段间以单元分隔符隔开
+        buf = bytearray()
 
         # 规范化查询文本
         normalized_query = query.strip().lower()
-        hasher.update(normalized_query.encode('utf-8'))
+        buf += normalized_query.encode('utf-8')
+        buf += b'\x1f'
 
         # 添加模型名称
-        hasher.update(model_name.encode('utf-8'))
+        buf += model_name.encode('utf-8')
+        buf += b'\x1f'
 
         # 添加上下文哈希（避免上下文过长）
         if context:
-            context_hash = hashlib.md5(context.encode('utf-8')).hexdigest()
-            hasher.update(context_hash.encode('utf-8'))
+            buf += md5(context.encode('utf-8')).hexdigest().encode('ascii')
+        buf += b'\x1f'
 
         # 添加额外参数
         if extra_params:
-            import json
-            params_str = json.dumps(extra_params, sort_keys=True)
-            hasher.update(params_str.encode('utf-8'))
+            buf += json.dumps(extra_params, sort_keys=True).encode('utf-8')
 
-        return hasher.hexdigest()
+        return sha256(buf).hexdigest()
 
     def cache_query_result(self,
                           query: str,
@@ -112,7 +175,8 @@ class QueryCache:
                           model_name: str,
                           response_time: float,
                           metadata: Optional[Dict[str, Any]] = None,
-                          ttl: Optional[int] = None) -> bool:
+                          ttl: Optional[int] = None,
+                          query_embedding: Optional[Sequence[float]] = None) -> bool:
         """缓存查询结果
 
         Args:
@@ -124,6 +188,7 @@ class QueryCache:
             response_time: 响应时间
             metadata: 元数据
             ttl: 缓存生存时间
+            query_embedding: 查询向量，提供时同时写入语义缓存
 
         Returns:
             是否成功缓存
@@ -133,6 +198,9 @@ class QueryCache:
                 # 计算查询哈希
                 query_hash = self.get_query_hash(query, model_name, context_used)
 
+                base_ttl = ttl or 1800  # 默认30分钟
+                effective_ttl = self._effective_ttl(query_hash, base_ttl)
+
                 # 创建缓存条目
                 cache_entry = QueryCacheEntry(
                     query_hash=query_hash,
@@ -142,41 +210,57 @@ class QueryCache:
                     context_used=context_used,
                     model_name=model_name,
                     response_time=response_time,
-                    cached_at=datetime.now(),
-                    metadata=metadata or {}
+                    cached_at=time.time(),
+                    metadata=metadata or {},
+                    base_ttl=base_ttl
                 )
 
+                if self._cache.supports_native_objects:
+                    # 进程内缓存直接保存对象，检索条目与查询条目共享同一检索块列表
+                    entry_value: Any = cache_entry
+                    retrieval_data = {'chunks': retrieved_chunks}
+                else:
+                    # 检索块按内容寻址只存一份，查询条目和检索条目仅引用其ID
+                    chunks_id = self._put_chunks(retrieved_chunks, ttl=effective_ttl)
+                    if chunks_id is None:
+                        return False
+
+                    entry_value = cache_entry.to_dict()
+                    del entry_value['retrieved_chunks']
+                    entry_value['chunks_id'] = chunks_id
+                    retrieval_data = {'chunks_id': chunks_id}
+
                 # 缓存查询结果
-                query_key = f"{self._query_prefix}{query_hash}"
+                query_key = self._query_prefix + query_hash
                 success = self._cache.put(
                     query_key,
-                    cache_entry.to_dict(),
-                    ttl=ttl or 1800  # 默认30分钟
+                    entry_value,
+                    ttl=effective_ttl
                 )
 
                 if success:
                     # 单独缓存检索结果（用于相似查询的快速检索）
-                    retrieval_key = f"{self._retrieval_prefix}{query_hash}"
-                    self._cache.put(
-                        retrieval_key,
-                        {
-                            'chunks': retrieved_chunks,
-                            'context': context_used,
-                            'query': query
-                        },
-                        ttl=ttl or 1800
-                    )
+                    retrieval_key = self._retrieval_prefix + query_hash
+                    retrieval_data.update({
+                        'context': context_used,
+                        'query': query,
+                        'base_ttl': base_ttl
+                    })
+                    self._cache.put(retrieval_key, retrieval_data, ttl=effective_ttl)
+
+                    if query_embedding is not None:
+                        self._add_query_embedding(query_hash, query_embedding)
 
                     # 记录指标
-                    self._metrics.increment_counter('query_cache_put_total', {
+                    self._increment_counter('query_cache_put_total', {
                         'model': model_name,
                         'query_length_bucket': self._get_length_bucket(len(query)),
                         'chunks_count': str(len(retrieved_chunks))
                     })
 
-                    self._metrics.record_metric('query_cache_response_length', len(response))
-                    self._metrics.record_metric('query_cache_chunks_count', len(retrieved_chunks))
-                    self._metrics.record_histogram('query_cache_response_time', response_time)
+                    self._record_metric('query_cache_response_length', len(response))
+                    self._record_metric('query_cache_chunks_count', len(retrieved_chunks))
+                    self._record_histogram('query_cache_response_time', response_time)
 
                     self._logger.debug(f"查询结果缓存成功: 哈希 {query_hash[:8]}, "
                                      f"响应长度: {len(response)}, 检索块: {len(retrieved_chunks)}")
@@ -209,34 +293,31 @@ class QueryCache:
                 query_hash = self.get_query_hash(query, model_name, context, extra_params)
 
                 # 获取缓存数据
-                query_key = f"{self._query_prefix}{query_hash}"
+                query_key = self._query_prefix + query_hash
                 cached_data = self._cache.get(query_key)
+                self._record_access(query_hash)
+
+                # 重构缓存条目（引用的检索块已被驱逐时视为未命中）
+                entry = self._entry_from_cache(cached_data) if cached_data else None
+
+                if entry is not None:
+                    # 热点查询命中时按访问频率延长TTL
+                    related_keys = [query_key, self._retrieval_prefix + query_hash]
+                    if isinstance(cached_data, dict) and 'chunks_id' in cached_data:
+                        related_keys.append(self._chunks_prefix + cached_data['chunks_id'])
+                    self._refresh_ttl(query_hash, entry.base_ttl, related_keys)
 
-                if cached_data:
                     # 记录缓存命中
-                    self._metrics.increment_counter('query_cache_hit_total', {
+                    self._increment_counter('query_cache_hit_total', {
                         'model': model_name,
                         'query_length_bucket': self._get_length_bucket(len(query))
                     })
 
-                    # 重构缓存条目
-                    entry = QueryCacheEntry(
-                        query_hash=cached_data['query_hash'],
-                        original_query=cached_data['original_query'],
-                        response=cached_data['response'],
-                        retrieved_chunks=cached_data['retrieved_chunks'],
-                        context_used=cached_data['context_used'],
-                        model_name=cached_data['model_name'],
-                        response_time=cached_data['response_time'],
-                        cached_at=datetime.fromisoformat(cached_data['cached_at']),
-                        metadata=cached_data.get('metadata', {})
-                    )
-
                     self._logger.debug(f"查询缓存命中: {query[:50]}..., 哈希: {query_hash[:8]}")
                     return entry
                 else:
                     # 记录缓存未命中
-                    self._metrics.increment_counter('query_cache_miss_total', {
+                    self._increment_counter('query_cache_miss_total', {
                         'model': model_name,
                         'query_length_bucket': self._get_length_bucket(len(query))
                     })
@@ -248,6 +329,144 @@ class QueryCache:
                 self._logger.error(f"获取查询缓存失败: {query[:50]}...", exception=e)
                 return None
 
+    def get_or_compute(self,
+                       query: str,
+                       model_name: str,
+                       context: str,
+                       compute_fn: Callable[[], Tuple[str, List[Dict[str, Any]]]],
+                       metadata: Optional[Dict[str, Any]] = None,
+                       ttl: Optional[int] = None) -> QueryCacheEntry:
+        """获取缓存的查询结果，未命中时只由一个线程计算
+
+        相同查询并发未命中时，只有首个线程调用 compute_fn，其余线程等待其
+        完成后直接读取缓存，避免重复的LLM生成。
+
+        Args:
+            query: 查询文本
+            model_name: 模型名称
+            context: 上下文
+            compute_fn: 计算函数，返回 (响应, 检索到的文档块)
+            metadata: 元数据
+            ttl: 缓存生存时间
+
+        Returns:
+            查询缓存条目
+        """
+        entry = self.get_query_result(query, model_name, context)
+        if entry is not None:
+            return entry
+
+        query_hash = self.get_query_hash(query, model_name, context)
+        stripe = self._stripes[hash(query_hash) & 63]
+
+        while True:
+            with stripe:
+                # 双重检查：等待锁期间可能已有线程写入缓存
+                cached_data = self._cache.get(self._query_prefix + query_hash)
+                entry = self._entry_from_cache(cached_data) if cached_data else None
+                if entry is not None:
+                    return entry
+
+                event = self._inflight.get(query_hash)
+                is_leader = event is None
+                if is_leader:
+                    event = threading.Event()
+                    self._inflight[query_hash] = event
+
+            if is_leader:
+                break
+
+            # 等待计算线程完成后重新读取；若其失败则重新竞争计算权
+            event.wait()
+
+        try:
+            start_time = time.time()
+            response, retrieved_chunks = compute_fn()
+            response_time = time.time() - start_time
+
+            self.cache_query_result(query, response, retrieved_chunks, context,
+                                    model_name, response_time, metadata, ttl)
+
+            return QueryCacheEntry(
+                query_hash=query_hash,
+                original_query=query,
+                response=response,
+                retrieved_chunks=retrieved_chunks,
+                context_used=context,
+                model_name=model_name,
+                response_time=response_time,
+                cached_at=time.time(),
+                metadata=metadata or {},
+                base_ttl=ttl or 1800
+            )
+        finally:
+            with stripe:
+                self._inflight.pop(query_hash, None)
+            event.set()
+
+    def get_similar_query_result(self,
+                                 query_embedding: Sequence[float],
+                                 threshold: float = 0.92,
+                                 max_age: Optional[float] = None,
+                                 retrieved_chunks: Optional[List[Dict[str, Any]]] = None,
+                                 min_chunk_overlap: float = 0.5) -> Optional[QueryCacheEntry]:
+        """按查询向量相似度获取缓存结果（语义二级缓存）
+
+        精确哈希未命中时使用，可命中措辞不同但语义相同的查询。
+
+        Args:
+            query_embedding: 当前查询向量
+            threshold: 余弦相似度阈值
+            max_age: 条目最大年龄（秒），超过视为过期
+            retrieved_chunks: 当前查询检索到的文档块，提供时校验与缓存条目的重合度
+            min_chunk_overlap: 检索块最小Jaccard重合度
+
+        Returns:
+            查询缓存条目或None
+        """
+        with self._lock:
+            try:
+                count = len(self._emb_keys)
+                query_vector = self._normalize_embedding(query_embedding)
+                if (count == 0 or query_vector is None
+                        or query_vector.shape[0] != self._emb_matrix.shape[1]):
+                    self._increment_counter('query_cache_semantic_miss_total')
+                    return None
+
+                sims = self._emb_matrix[:count] @ query_vector
+                index = int(np.argmax(sims))
+                similarity = float(sims[index])
+                query_hash = self._emb_keys[index]
+
+                entry = None
+                if similarity >= threshold:
+                    if max_age is not None and time.time() - self._emb_populated_at[index] > max_age:
+                        self._remove_embedding_row(index)
+                    else:
+                        cached_data = self._cache.get(self._query_prefix + query_hash)
+                        entry = self._entry_from_cache(cached_data) if cached_data else None
+                        if entry is None:
+                            # 底层条目已过期或被驱逐
+                            self._remove_embedding_row(index)
+
+                if entry is not None and retrieved_chunks is not None:
+                    overlap = self._chunk_overlap(retrieved_chunks, entry.retrieved_chunks)
+                    if overlap < min_chunk_overlap:
+                        entry = None
+
+                if entry is None:
+                    self._increment_counter('query_cache_semantic_miss_total')
+                    return None
+
+                self._increment_counter('query_cache_semantic_hit_total')
+                self._record_histogram('query_cache_semantic_similarity', similarity)
+                self._logger.debug(f"语义缓存命中: 哈希 {query_hash[:8]}, 相似度: {similarity:.3f}")
+                return entry
+
+            except Exception as e:
+                self._logger.error("获取语义缓存失败", exception=e)
+                return None
+
     def get_similar_queries(self,
                            query: str,
                            limit: int = 5) -> List[Dict[str, Any]]:
@@ -289,27 +508,30 @@ class QueryCache:
         with self._lock:
             try:
                 # 使用简化的哈希（只基于查询）
-                query_hash = hashlib.sha256(query.strip().lower().encode('utf-8')).hexdigest()
+                query_hash = sha256(query.strip().lower().encode('utf-8')).hexdigest()
 
-                retrieval_key = f"{self._retrieval_prefix}{query_hash}"
+                retrieval_key = self._retrieval_prefix + query_hash
+
+                base_ttl = ttl or 3600  # 默认1小时
 
                 retrieval_data = {
                     'query': query,
                     'chunks': retrieved_chunks,
                     'retrieval_time': retrieval_time,
-                    'cached_at': datetime.now().isoformat()
+                    'cached_at': time.time(),
+                    'base_ttl': base_ttl
                 }
 
                 success = self._cache.put(
                     retrieval_key,
                     retrieval_data,
-                    ttl=ttl or 3600  # 默认1小时
+                    ttl=self._effective_ttl(query_hash, base_ttl)
                 )
 
                 if success:
-                    self._metrics.increment_counter('retrieval_cache_put_total')
-                    self._metrics.record_metric('retrieval_cache_chunks_count', len(retrieved_chunks))
-                    self._metrics.record_histogram('retrieval_cache_time', retrieval_time)
+                    self._increment_counter('retrieval_cache_put_total')
+                    self._record_metric('retrieval_cache_chunks_count', len(retrieved_chunks))
+                    self._record_histogram('retrieval_cache_time', retrieval_time)
 
                 return success
 
@@ -328,16 +550,30 @@ class QueryCache:
         """
         with self._lock:
             try:
-                query_hash = hashlib.sha256(query.strip().lower().encode('utf-8')).hexdigest()
-                retrieval_key = f"{self._retrieval_prefix}{query_hash}"
+                query_hash = sha256(query.strip().lower().encode('utf-8')).hexdigest()
+                retrieval_key = self._retrieval_prefix + query_hash
 
                 cached_data = self._cache.get(retrieval_key)
+                self._record_access(query_hash)
+
+                if cached_data:
+                    related_keys = [retrieval_key]
+                    if 'chunks_id' in cached_data:
+                        related_keys.append(self._chunks_prefix + cached_data['chunks_id'])
+                    self._refresh_ttl(query_hash, cached_data.get('base_ttl', 3600), related_keys)
+
+                if cached_data and 'chunks_id' in cached_data:
+                    chunks = self.get_chunks_by_id(cached_data['chunks_id'])
+                    if chunks is None:
+                        cached_data = None
+                    else:
+                        cached_data = dict(cached_data, chunks=chunks)
 
                 if cached_data:
-                    self._metrics.increment_counter('retrieval_cache_hit_total')
+                    self._increment_counter('retrieval_cache_hit_total')
                     self._logger.debug(f"检索缓存命中: {query[:50]}...")
                 else:
-                    self._metrics.increment_counter('retrieval_cache_miss_total')
+                    self._increment_counter('retrieval_cache_miss_total')
 
                 return cached_data
 
@@ -345,29 +581,43 @@ class QueryCache:
                 self._logger.error(f"获取检索缓存失败: {query[:50]}...", exception=e)
                 return None
 
-    def invalidate_query(self, query: str, model_name: str = "") -> bool:
+    def invalidate_query(self,
+                         query: str = "",
+                         model_name: str = "",
+                         *,
+                         query_hash: Optional[str] = None,
+                         context: str = "") -> bool:
         """使查询缓存失效
 
+        先读后失效的调用方应直接传入命中条目的 QueryCacheEntry.query_hash，
+        避免重新计算哈希。
+
         Args:
             query: 查询文本
             model_name: 模型名称
+            query_hash: 预先计算的查询哈希，提供时忽略 query/model_name/context
+            context: 缓存时使用的上下文
 
         Returns:
             是否成功
         """
         with self._lock:
             try:
-                query_hash = self.get_query_hash(query, model_name)
+                if query_hash is None:
+                    query_hash = self.get_query_hash(query, model_name, context)
 
-                query_key = f"{self._query_prefix}{query_hash}"
-                retrieval_key = f"{self._retrieval_prefix}{query_hash}"
+                query_key = self._query_prefix + query_hash
+                retrieval_key = self._retrieval_prefix + query_hash
 
                 query_deleted = self._cache.delete(query_key)
                 retrieval_deleted = self._cache.delete(retrieval_key)
 
+                if query_hash in self._emb_keys:
+                    self._remove_embedding_row(self._emb_keys.index(query_hash))
+
                 if query_deleted or retrieval_deleted:
-                    self._metrics.increment_counter('query_cache_invalidate_total')
-                    self._logger.info(f"查询缓存已失效: {query[:50]}...")
+                    self._increment_counter('query_cache_invalidate_total')
+                    self._logger.info(f"查询缓存已失效: {query[:50]}..., 哈希: {query_hash[:8]}")
                     return True
 
                 return False
@@ -392,6 +642,237 @@ class QueryCache:
             'cache_type': 'query_cache'
         }
 
+    def get_chunks_by_id(self, chunks_id: str) -> Optional[List[Dict[str, Any]]]:
+        """按内容ID获取缓存的检索块
+
+        Args:
+            chunks_id: 检索块内容ID
+
+        Returns:
+            检索块列表或None
+        """
+        return self._cache.get(self._chunks_prefix + chunks_id)
+
+    def _put_chunks(self, retrieved_chunks: List[Dict[str, Any]], ttl: int) -> Optional[str]:
+        """按内容寻址缓存检索块，返回内容ID（失败返回None）"""
+        chunks_id = md5(pickle.dumps(retrieved_chunks)).hexdigest()
+        chunks_key = self._chunks_prefix + chunks_id
+
+        if self._cache.put(chunks_key, retrieved_chunks, ttl=ttl):
+            return chunks_id
+        return None
+
+    def _sketch_indices(self, query_hash: str) -> List[int]:
+        """从查询哈希的4个不相交片段派生草图各行的列索引"""
+        return [int(query_hash[i * 8:(i + 1) * 8], 16) & 1023 for i in range(4)]
+
+    def _record_access(self, query_hash: str) -> None:
+        """在频率草图中记录一次访问（保守更新，只增加最小计数；调用方需持有 self._lock）"""
+        if not self._adaptive_ttl:
+            return
+
+        columns = np.array(self._sketch_indices(query_hash))
+        counts = self._freq_sketch[_SKETCH_ROWS, columns]
+        current = counts.min()
+        if current < 0xFFFF:
+            is_min = counts == current
+            self._freq_sketch[_SKETCH_ROWS[is_min], columns[is_min]] += 1
+
+        # 老化：累计到样本量后计数减半，避免所有查询的估计频率无限增长
+        self._sketch_additions += 1
+        if self._sketch_additions >= _SKETCH_SAMPLE_SIZE:
+            self._freq_sketch >>= 1
+            self._sketch_additions = 0
+
+    def _estimate_frequency(self, query_hash: str) -> int:
+        """估计查询哈希的访问频率"""
+        return int(self._freq_sketch[_SKETCH_ROWS, self._sketch_indices(query_hash)].min())
+
+    def _effective_ttl(self, query_hash: str, base_ttl: int) -> int:
+        """按访问频率计算TTL：base * (1 + log2(1 + freq))，限制在 [base, 8 * base]"""
+        if not self._adaptive_ttl:
+            return base_ttl
+
+        frequency = self._estimate_frequency(query_hash)
+        return int(min(base_ttl * (1 + log2(1 + frequency)), base_ttl * 8))
+
+    def _refresh_ttl(self, query_hash: str, base_ttl: int, keys: List[str]) -> None:
+        """命中时按当前频率延长相关缓存项的TTL"""
+        if not self._adaptive_ttl:
+            return
+
+        effective_ttl = self._effective_ttl(query_hash, base_ttl)
+        for key in keys:
+            self._cache.touch(key, effective_ttl)
+
+    def _normalize_embedding(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """转换为单位长度的float32向量（零向量返回None）"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _add_query_embedding(self, query_hash: str, embedding: Sequence[float]) -> None:
+        """将查询向量写入语义缓存矩阵"""
+        vector = self._normalize_embedding(embedding)
+        if vector is None or self._max_semantic_entries <= 0:
+            return
+
+        if self._emb_matrix is not None and self._emb_matrix.shape[1] != vector.shape[0]:
+            # 向量维度变化（如更换嵌入模型），旧向量不再可比
+            self._emb_matrix = None
+            self._emb_keys.clear()
+            self._emb_populated_at.clear()
+
+        if query_hash in self._emb_keys:
+            self._remove_embedding_row(self._emb_keys.index(query_hash))
+        elif len(self._emb_keys) >= self._max_semantic_entries:
+            oldest = min(range(len(self._emb_populated_at)), key=self._emb_populated_at.__getitem__)
+            self._remove_embedding_row(oldest)
+
+        count = len(self._emb_keys)
+        if self._emb_matrix is None:
+            capacity = min(64, self._max_semantic_entries)
+            self._emb_matrix = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+        elif count >= self._emb_matrix.shape[0]:
+            capacity = min(self._emb_matrix.shape[0] * 2, self._max_semantic_entries)
+            grown = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+            grown[:count] = self._emb_matrix[:count]
+            self._emb_matrix = grown
+
+        self._emb_matrix[count] = vector
+        self._emb_keys.append(query_hash)
+        self._emb_populated_at.append(time.time())
+
+    def _remove_embedding_row(self, index: int) -> None:
+        """从语义缓存中移除一行（用末行填补空位）"""
+        last = len(self._emb_keys) - 1
+        if index != last:
+            self._emb_matrix[index] = self._emb_matrix[last]
+            self._emb_keys[index] = self._emb_keys[last]
+            self._emb_populated_at[index] = self._emb_populated_at[last]
+
+        self._emb_keys.pop()
+        self._emb_populated_at.pop()
+
+    def _chunk_overlap(self,
+                       chunks_a: List[Dict[str, Any]],
+                       chunks_b: List[Dict[str, Any]]) -> float:
+        """计算两组检索块的Jaccard重合度"""
+        keys_a = {json.dumps(chunk, sort_keys=True, default=str) for chunk in chunks_a}
+        keys_b = {json.dumps(chunk, sort_keys=True, default=str) for chunk in chunks_b}
+        union = keys_a | keys_b
+        if not union:
+            return 1.0
+        return len(keys_a & keys_b) / len(union)
+
+    def _entry_from_cache(self, cached_data: Any) -> Optional[QueryCacheEntry]:
+        """从缓存数据重构查询缓存条目（引用的检索块缺失时返回None）"""
+        if isinstance(cached_data, QueryCacheEntry):
+            return cached_data
+
+        if 'chunks_id' in cached_data:
+            retrieved_chunks = self.get_chunks_by_id(cached_data['chunks_id'])
+            if retrieved_chunks is None:
+                return None
+        else:
+            retrieved_chunks = cached_data['retrieved_chunks']
+
+        cached_at = cached_data['cached_at']
+        if isinstance(cached_at, str):
+            # 兼容旧版持久化数据中的ISO时间字符串
+            cached_at = datetime.fromisoformat(cached_at).timestamp()
+
+        return QueryCacheEntry(
+            query_hash=cached_data['query_hash'],
+            original_query=cached_data['original_query'],
+            response=cached_data['response'],
+            retrieved_chunks=retrieved_chunks,
+            context_used=cached_data['context_used'],
+            model_name=cached_data['model_name'],
+            response_time=cached_data['response_time'],
+            cached_at=cached_at,
+            metadata=cached_data.get('metadata', {}),
+            base_ttl=cached_data.get('base_ttl', 1800)
+        )
+
+    def flush_metrics(self) -> None:
+        """将所有线程缓冲的指标提交给指标服务，并清理已结束线程的缓冲区"""
+        with self._metrics_buffers_lock:
+            buffers = list(self._metrics_buffers)
+
+        finished = []
+        for entry in buffers:
+            # 先判断线程是否已结束：已结束的线程不会再写入，提交后即可丢弃其缓冲区
+            if not entry[2].is_alive():
+                finished.append(entry)
+            self._drain_metrics(entry)
+
+        if finished:
+            finished_ids = {id(entry) for entry in finished}
+            with self._metrics_buffers_lock:
+                self._metrics_buffers = [
+                    entry for entry in self._metrics_buffers if id(entry) not in finished_ids
+                ]
+
+    def _drain_metrics(self, entry: List[Any]) -> None:
+        """在缓冲区锁内换出样本列表并提交，保证同一线程的样本按顺序提交"""
+        with entry[0]:
+            samples = entry[1]
+            if samples:
+                entry[1] = []
+                self._metrics.bulk_emit(samples)
+
+    def _metrics_flush_loop(self) -> None:
+        """后台定期提交缓冲指标"""
+        while not self._metrics_stop.wait(_METRICS_FLUSH_INTERVAL):
+            try:
+                self.flush_metrics()
+            except Exception as e:
+                self._logger.error("提交缓冲指标失败", exception=e)
+
+    def _close_metrics(self) -> None:
+        """停止后台提交线程并提交剩余指标"""
+        self._metrics_stop.set()
+        self.flush_metrics()
+
+    def _buffer_metric(self,
+                       kind: str,
+                       name: str,
+                       value: float,
+                       tags: Optional[Dict[str, str]]) -> None:
+        """缓冲一条指标，满一批后提交"""
+        entry = getattr(self._metrics_local, 'entry', None)
+        if entry is None:
+            entry = self._metrics_local.entry = [threading.Lock(), [], threading.current_thread()]
+            with self._metrics_buffers_lock:
+                self._metrics_buffers.append(entry)
+                # 首次缓冲时启动后台提交线程
+                if self._metrics_flush_thread is None:
+                    self._metrics_flush_thread = threading.Thread(
+                        target=self._metrics_flush_loop,
+                        name="query-cache-metrics-flush",
+                        daemon=True
+                    )
+                    self._metrics_flush_thread.start()
+
+        with entry[0]:
+            samples = entry[1]
+            samples.append((kind, name, value, tags))
+            if len(samples) >= _METRICS_BATCH_SIZE:
+                entry[1] = []
+                self._metrics.bulk_emit(samples)
+
+    def _increment_counter(self, name: str, tags: Optional[Dict[str, str]] = None) -> None:
+        self._buffer_metric('counter', name, 1.0, tags)
+
+    def _record_metric(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        self._buffer_metric('gauge', name, value, tags)
+
+    def _record_histogram(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        self._buffer_metric('histogram', name, value, tags)
+
     def _get_length_bucket(self, length: int) -> str:
         """获取长度分桶"""
         if length <= 50:
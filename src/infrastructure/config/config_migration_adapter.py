@@ -8,84 +8,80 @@ from typing import Optional, List, Dict, Any
 from ..config.configuration_service import ConfigurationService, get_config_service
 
 
-class ConfigMigrationAdapter:
-    """配置迁移适配器 - 提供Config类兼容接口"""
-
-    def __init__(self, config_service: Optional[ConfigurationService] = None):
-        """初始化适配器
-
-        Args:
-            config_service: 配置服务实例，如果不提供则使用默认实例
-        """
-        self._config_service = config_service or get_config_service()
-
+# 兼容属性名 -> (配置键, 默认值)
+_LEGACY_FIELDS = {
     # Google API 配置
-    @property
-    def GOOGLE_API_KEY(self) -> Optional[str]:
-        return self._config_service.get_value("google_api_key")
+    "GOOGLE_API_KEY": ("google_api_key", None),
 
     # 模型配置
-    @property
-    def EMBEDDING_MODEL(self) -> str:
-        return self._config_service.get_value("embedding_model", "models/embedding-001")
-
-    @property
-    def CHAT_MODEL(self) -> str:
-        return self._config_service.get_value("chat_model", "gemini-2.0-flash-001")
+    "EMBEDDING_MODEL": ("embedding_model", "models/embedding-001"),
+    "CHAT_MODEL": ("chat_model", "gemini-2.0-flash-001"),
 
     # 文本处理配置
-    @property
-    def CHUNK_SIZE(self) -> int:
-        return self._config_service.get_value("chunk_size", 1000)
-
-    @property
-    def CHUNK_OVERLAP(self) -> int:
-        return self._config_service.get_value("chunk_overlap", 200)
+    "CHUNK_SIZE": ("chunk_size", 1000),
+    "CHUNK_OVERLAP": ("chunk_overlap", 200),
 
     # 语义分块配置
-    @property
-    def USE_SEMANTIC_CHUNKING(self) -> bool:
-        return self._config_service.get_value("use_semantic_chunking", True)
+    "USE_SEMANTIC_CHUNKING": ("use_semantic_chunking", True),
+    "SEMANTIC_MIN_CHUNK_SIZE": ("semantic_min_chunk_size", 100),
+    "SEMANTIC_MAX_CHUNK_SIZE": ("semantic_max_chunk_size", 2000),
+    "FALLBACK_TO_TRADITIONAL": ("fallback_to_traditional", True),
 
-    @property
-    def SEMANTIC_MIN_CHUNK_SIZE(self) -> int:
-        return self._config_service.get_value("semantic_min_chunk_size", 100)
+    # 检索配置
+    "SIMILARITY_TOP_K": ("similarity_top_k", 4),
+    "MAX_TOKENS": ("max_tokens", 1000),
 
-    @property
-    def SEMANTIC_MAX_CHUNK_SIZE(self) -> int:
-        return self._config_service.get_value("semantic_max_chunk_size", 2000)
+    # 数据库配置
+    "CHROMA_DB_PATH": ("chroma_db_path", "./chroma_db"),
 
-    @property
-    def FALLBACK_TO_TRADITIONAL(self) -> bool:
-        return self._config_service.get_value("fallback_to_traditional", True)
+    # 文件上传配置
+    "MAX_FILE_SIZE_MB": ("max_file_size_mb", 50),
+    "ALLOWED_FILE_TYPES": ("allowed_file_types", [".pdf"]),
 
-    # 检索配置
-    @property
-    def SIMILARITY_TOP_K(self) -> int:
-        return self._config_service.get_value("similarity_top_k", 4)
+    # 对话配置
+    "MAX_HISTORY_LENGTH": ("max_history_length", 10),
+}
 
-    @property
-    def MAX_TOKENS(self) -> int:
-        return self._config_service.get_value("max_tokens", 1000)
 
-    # 数据库配置
-    @property
-    def CHROMA_DB_PATH(self) -> str:
-        return self._config_service.get_value("chroma_db_path", "./chroma_db")
+class ConfigMigrationAdapter:
+    """配置迁移适配器 - 提供Config类兼容接口
+
+    兼容属性在构造时一次性从配置服务读取为普通实例属性，
+    配置变更后需调用 refresh() 重新同步。
+    """
+
+    __slots__ = ('_config_service',) + tuple(_LEGACY_FIELDS)
+
+    GOOGLE_API_KEY: Optional[str]
+    EMBEDDING_MODEL: str
+    CHAT_MODEL: str
+    CHUNK_SIZE: int
+    CHUNK_OVERLAP: int
+    USE_SEMANTIC_CHUNKING: bool
+    SEMANTIC_MIN_CHUNK_SIZE: int
+    SEMANTIC_MAX_CHUNK_SIZE: int
+    FALLBACK_TO_TRADITIONAL: bool
+    SIMILARITY_TOP_K: int
+    MAX_TOKENS: int
+    CHROMA_DB_PATH: str
+    MAX_FILE_SIZE_MB: int
+    ALLOWED_FILE_TYPES: List[str]
+    MAX_HISTORY_LENGTH: int
 
-    # 文件上传配置
-    @property
-    def MAX_FILE_SIZE_MB(self) -> int:
-        return self._config_service.get_value("max_file_size_mb", 50)
+    def __init__(self, config_service: Optional[ConfigurationService] = None):
+        """初始化适配器
 
-    @property
-    def ALLOWED_FILE_TYPES(self) -> List[str]:
-        return self._config_service.get_value("allowed_file_types", [".pdf"])
+        Args:
+            config_service: 配置服务实例，如果不提供则使用默认实例
+        """
+        self._config_service = config_service or get_config_service()
+        self.refresh()
 
-    # 对话配置
-    @property
-    def MAX_HISTORY_LENGTH(self) -> int:
-        return self._config_service.get_value("max_history_length", 10)
+    def refresh(self) -> None:
+        """从配置服务重新读取所有兼容属性"""
+        get_value = self._config_service.get_value
+        for attr, (key, default) in _LEGACY_FIELDS.items():
+            setattr(self, attr, get_value(key, default))
 
     def validate_config(self) -> bool:
         """验证配置是否有效"""
@@ -4,12 +4,57 @@
 """
 
 import os
+import threading
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Union, List
 from dataclasses import dataclass
 from enum import Enum
 from dotenv import load_dotenv
 
+from ..utilities.dataclass_slots import add_slots
+
+
+# 缓存未命中标记（配置值本身可能为None）
+_MISSING = object()
+
+
+def _to_bool(value: str, default_value: Any) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+def _to_int(value: str, default_value: Any) -> Any:
+    try:
+        return int(value)
+    except ValueError:
+        return default_value
+
+
+def _to_float(value: str, default_value: Any) -> Any:
+    try:
+        return float(value)
+    except ValueError:
+        return default_value
+
+
+def _to_list(value: str, default_value: Any) -> List[str]:
+    # 支持逗号分隔的列表
+    if ',' in value:
+        return [item.strip() for item in value.split(',')]
+    return [value]
+
+
+def _to_str(value: str, default_value: Any) -> str:
+    return value
+
+
+# 按默认值的精确类型分派环境变量转换（bool 不会误匹配 int）
+_CONVERTERS = {
+    bool: _to_bool,
+    int: _to_int,
+    float: _to_float,
+    list: _to_list,
+}
+
 
 class Environment(Enum):
     """运行环境枚举"""
@@ -19,7 +64,8 @@ class Environment(Enum):
     STAGING = "staging"
 
 
-@dataclass
+@add_slots
+@dataclass(frozen=True)
 class ConfigurationValidationResult:
     """配置验证结果"""
     is_valid: bool
@@ -77,10 +123,17 @@ class ConfigurationService(IConfigurationService):
         # 初始化默认配置
         self._init_default_configs()
 
+        # 预加载配置到缓存
+        self._preload_configs()
+
         # 敏感配置列表（用于安全显示）
         self._sensitive_keys = {
             'google_api_key', 'api_key', 'secret', 'password', 'token'
         }
+        self._sensitive_key_set = frozenset(
+            key for key in self._default_configs
+            if any(sensitive in key.lower() for sensitive in self._sensitive_keys)
+        )
 
     def _detect_environment(self) -> Environment:
         """自动检测运行环境"""
@@ -148,6 +201,7 @@ class ConfigurationService(IConfigurationService):
             "request_timeout_seconds": 120,
             "max_concurrent_requests": 5,
             "rate_limit_requests_per_minute": 60,
+            "adaptive_ttl_enabled": True,  # 查询缓存按访问频率自适应延长TTL
 
             # UI配置
             "gradio_server_name": "127.0.0.1",
@@ -177,11 +231,22 @@ class ConfigurationService(IConfigurationService):
                 "chroma_db_path": "./test_chroma_db",
             })
 
+    def _preload_configs(self) -> None:
+        """预加载所有默认配置项（环境变量优先）到缓存"""
+        environ = os.environ
+        for key, default_value in self._default_configs.items():
+            env_value = environ.get(key.upper())
+            if env_value is not None:
+                self._config_cache[key] = self._convert_value(env_value, key)
+            else:
+                self._config_cache[key] = default_value
+
     def get_value(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
-        # 先检查缓存
-        if key in self._config_cache:
-            return self._config_cache[key]
+        # 已知配置项均已预加载，只需一次字典查找
+        value = self._config_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
 
         # 转换为环境变量格式
         env_key = key.upper()
@@ -194,12 +259,6 @@ class ConfigurationService(IConfigurationService):
             self._config_cache[key] = converted_value
             return converted_value
 
-        # 从默认配置获取
-        if key in self._default_configs:
-            value = self._default_configs[key]
-            self._config_cache[key] = value
-            return value
-
         # 返回提供的默认值
         return default
 
@@ -212,26 +271,7 @@ class ConfigurationService(IConfigurationService):
         # 获取默认值以确定类型
         default_value = self._default_configs.get(key)
 
-        if isinstance(default_value, bool):
-            return value.lower() in ('true', '1', 'yes', 'on')
-        elif isinstance(default_value, int):
-            try:
-                return int(value)
-            except ValueError:
-                return default_value
-        elif isinstance(default_value, float):
-            try:
-                return float(value)
-            except ValueError:
-                return default_value
-        elif isinstance(default_value, list):
-            # 支持逗号分隔的列表
-            if ',' in value:
-                return [item.strip() for item in value.split(',')]
-            else:
-                return [value]
-        else:
-            return value
+        return _CONVERTERS.get(type(default_value), _to_str)(value, default_value)
 
     def validate_configuration(self) -> ConfigurationValidationResult:
         """验证配置完整性"""
@@ -281,24 +321,26 @@ class ConfigurationService(IConfigurationService):
 
     def get_all_configs(self) -> Dict[str, Any]:
         """获取所有配置项（安全版本）"""
-        all_configs = {}
-
-        # 合并默认配置和缓存配置
-        for key in self._default_configs.keys():
-            value = self.get_value(key)
-
-            # 敏感信息脱敏处理
-            if any(sensitive in key.lower() for sensitive in self._sensitive_keys):
-                if value and len(str(value)) > 8:
-                    all_configs[key] = f"{str(value)[:4]}...{str(value)[-4:]}"
-                elif value:
-                    all_configs[key] = "***已配置***"
-                else:
-                    all_configs[key] = "***未配置***"
-            else:
-                all_configs[key] = value
+        # 默认配置项均已预加载到缓存，直接读取缓存并对敏感信息脱敏
+        config_cache = self._config_cache
+        sensitive_keys = self._sensitive_key_set
+        mask = self._mask_sensitive_value
+
+        return {
+            key: mask(config_cache[key]) if key in sensitive_keys else config_cache[key]
+            for key in self._default_configs
+        }
+
+    @staticmethod
+    def _mask_sensitive_value(value: Any) -> str:
+        """敏感配置值脱敏"""
+        if not value:
+            return "***未配置***"
 
-        return all_configs
+        text = str(value)
+        if len(text) > 8:
+            return text[:4] + "..." + text[-4:]
+        return "***已配置***"
 
     def get_model_configs(self) -> Dict[str, Any]:
         """获取模型相关配置"""
@@ -332,17 +374,23 @@ class ConfigurationService(IConfigurationService):
         """重新加载配置"""
         self._config_cache.clear()
         load_dotenv(override=True)
+        self._preload_configs()
 
 
 # 创建全局配置服务单例
 _config_service: Optional[ConfigurationService] = None
+_config_lock = threading.Lock()
 
 
 def get_config_service() -> ConfigurationService:
     """获取配置服务单例"""
     global _config_service
+
     if _config_service is None:
-        _config_service = ConfigurationService()
+        with _config_lock:
+            if _config_service is None:
+                _config_service = ConfigurationService()
+
     return _config_service
 
 
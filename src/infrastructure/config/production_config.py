@@ -6,16 +6,75 @@
 import os
 import json
 import secrets
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+import stat
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, fields
 from pathlib import Path
 import hashlib
 
+try:
+    import orjson  # 可选依赖，未安装时回退到标准库 json
+except ImportError:
+    orjson = None
+
 from ..logging.logging_service import get_logging_service
+from ..utilities.dataclass_slots import add_slots
+
+
+# 各配置类的字段名缓存
+_FIELDS_CACHE: Dict[type, Tuple[str, ...]] = {}
+
+
+def _fast_asdict(obj: Any) -> Dict[str, Any]:
+    """将扁平配置数据类转换为字典
+
+    配置字段只包含基本类型及其列表/字典，浅拷贝容器即等价于 asdict 的深拷贝，
+    且字段名按类缓存，无需每次重新内省。
+    """
+    cls = type(obj)
+    names = _FIELDS_CACHE.get(cls)
+    if names is None:
+        names = _FIELDS_CACHE[cls] = tuple(f.name for f in fields(cls))
+
+    result = {}
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is list or type(value) is dict:
+            value = value.copy()
+        result[name] = value
+    return result
+
 
+def _loads_json(data: bytes) -> Any:
+    """解析配置文件内容"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
+
+def _dumps_json(obj: Any) -> str:
+    """序列化配置为缩进格式的 JSON 文本"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+class _VersionedConfig:
+    """字段赋值时递增版本号，用于判断配置是否变更（不跟踪列表/字典的原地修改）"""
+
+    __slots__ = ('_version',)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+
+
+@add_slots
 @dataclass
-class SecurityConfig:
+class SecurityConfig(_VersionedConfig):
     """安全配置"""
     api_key_encryption: bool = True
     rate_limiting_enabled: bool = True
@@ -33,8 +92,9 @@ class SecurityConfig:
             self.allowed_file_types = [".pdf", ".txt", ".docx", ".md"]
 
 
+@add_slots
 @dataclass
-class PerformanceConfig:
+class PerformanceConfig(_VersionedConfig):
     """性能配置"""
     max_concurrent_requests: int = 100
     request_timeout: int = 300
@@ -47,8 +107,9 @@ class PerformanceConfig:
     cpu_cores_limit: int = 4
 
 
+@add_slots
 @dataclass
-class MonitoringConfig:
+class MonitoringConfig(_VersionedConfig):
     """监控配置"""
     metrics_enabled: bool = True
     health_check_interval: int = 60
@@ -68,8 +129,9 @@ class MonitoringConfig:
             }
 
 
+@add_slots
 @dataclass
-class DatabaseConfig:
+class DatabaseConfig(_VersionedConfig):
     """数据库配置"""
     connection_pool_size: int = 20
     connection_timeout: int = 30
@@ -80,8 +142,9 @@ class DatabaseConfig:
     vacuum_interval_hours: int = 168  # 一周
 
 
+@add_slots
 @dataclass
-class CacheConfig:
+class CacheConfig(_VersionedConfig):
     """缓存配置"""
     redis_url: Optional[str] = None
     default_ttl: int = 3600
@@ -91,9 +154,44 @@ class CacheConfig:
     distributed: bool = False
 
 
+def _env_bool(value: str) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
 class ProductionConfigManager:
     """生产环境配置管理器"""
 
+    # 环境变量映射：(环境变量, 配置段, 字段, 类型转换函数)
+    _ENV_MAPPINGS = (
+        # 安全配置
+        ('SECURITY_API_KEY_ENCRYPTION', 'security', 'api_key_encryption', _env_bool),
+        ('SECURITY_RATE_LIMITING', 'security', 'rate_limiting_enabled', _env_bool),
+        ('SECURITY_MAX_FILE_SIZE', 'security', 'max_file_size_mb', int),
+        ('SECURITY_SESSION_TIMEOUT', 'security', 'session_timeout', int),
+
+        # 性能配置
+        ('PERFORMANCE_MAX_REQUESTS', 'performance', 'max_concurrent_requests', int),
+        ('PERFORMANCE_REQUEST_TIMEOUT', 'performance', 'request_timeout', int),
+        ('PERFORMANCE_CACHE_SIZE', 'performance', 'cache_size_mb', int),
+        ('PERFORMANCE_THREAD_POOL', 'performance', 'thread_pool_size', int),
+        ('PERFORMANCE_MEMORY_LIMIT', 'performance', 'memory_limit_mb', int),
+
+        # 监控配置
+        ('MONITORING_LOG_LEVEL', 'monitoring', 'log_level', str),
+        ('MONITORING_HEALTH_INTERVAL', 'monitoring', 'health_check_interval', int),
+        ('MONITORING_RETENTION_DAYS', 'monitoring', 'retention_days', int),
+
+        # 数据库配置
+        ('DATABASE_POOL_SIZE', 'database', 'connection_pool_size', int),
+        ('DATABASE_TIMEOUT', 'database', 'connection_timeout', int),
+        ('DATABASE_BACKUP_INTERVAL', 'database', 'backup_interval_hours', int),
+
+        # 缓存配置
+        ('CACHE_REDIS_URL', 'cache', 'redis_url', str),
+        ('CACHE_DEFAULT_TTL', 'cache', 'default_ttl', int),
+        ('CACHE_MAX_SIZE', 'cache', 'max_cache_size_mb', int),
+    )
+
     def __init__(self, config_dir: str = "config"):
         """初始化配置管理器
 
@@ -111,37 +209,18 @@ class ProductionConfigManager:
         self.database = DatabaseConfig()
         self.cache = CacheConfig()
 
-        # 环境变量映射
-        self._env_mappings = {
-            # 安全配置
-            'SECURITY_API_KEY_ENCRYPTION': ('security', 'api_key_encryption', bool),
-            'SECURITY_RATE_LIMITING': ('security', 'rate_limiting_enabled', bool),
-            'SECURITY_MAX_FILE_SIZE': ('security', 'max_file_size_mb', int),
-            'SECURITY_SESSION_TIMEOUT': ('security', 'session_timeout', int),
-
-            # 性能配置
-            'PERFORMANCE_MAX_REQUESTS': ('performance', 'max_concurrent_requests', int),
-            'PERFORMANCE_REQUEST_TIMEOUT': ('performance', 'request_timeout', int),
-            'PERFORMANCE_CACHE_SIZE': ('performance', 'cache_size_mb', int),
-            'PERFORMANCE_THREAD_POOL': ('performance', 'thread_pool_size', int),
-            'PERFORMANCE_MEMORY_LIMIT': ('performance', 'memory_limit_mb', int),
-
-            # 监控配置
-            'MONITORING_LOG_LEVEL': ('monitoring', 'log_level', str),
-            'MONITORING_HEALTH_INTERVAL': ('monitoring', 'health_check_interval', int),
-            'MONITORING_RETENTION_DAYS': ('monitoring', 'retention_days', int),
-
-            # 数据库配置
-            'DATABASE_POOL_SIZE': ('database', 'connection_pool_size', int),
-            'DATABASE_TIMEOUT': ('database', 'connection_timeout', int),
-            'DATABASE_BACKUP_INTERVAL': ('database', 'backup_interval_hours', int),
-
-            # 缓存配置
-            'CACHE_REDIS_URL': ('cache', 'redis_url', str),
-            'CACHE_DEFAULT_TTL': ('cache', 'default_ttl', int),
-            'CACHE_MAX_SIZE': ('cache', 'max_cache_size_mb', int),
+        # 各配置段允许的字段名，用于过滤配置文件中的未知键
+        self._allowed_fields: Dict[str, frozenset] = {
+            section: frozenset(f.name for f in fields(getattr(self, section)))
+            for section in ('security', 'performance', 'monitoring', 'database', 'cache')
         }
 
+        # 配置摘要缓存：(各配置段版本号, 摘要)
+        self._summary_cache: Optional[Tuple[Tuple[int, ...], str]] = None
+
+        # 各配置文件最近一次保存的内容，未变化的配置段不重复写入
+        self._saved_contents: Dict[str, str] = {}
+
         # 加载配置
         self._load_from_environment()
         self._load_from_files()
@@ -150,21 +229,15 @@ class ProductionConfigManager:
 
     def _load_from_environment(self):
         """从环境变量加载配置"""
-        for env_var, (section, field, var_type) in self._env_mappings.items():
-            value = os.getenv(env_var)
+        environ = os.environ
+        for env_var, section, field, cast in self._ENV_MAPPINGS:
+            value = environ.get(env_var)
             if value is not None:
                 try:
-                    # 类型转换
-                    if var_type == bool:
-                        value = value.lower() in ('true', '1', 'yes', 'on')
-                    elif var_type == int:
-                        value = int(value)
-                    elif var_type == float:
-                        value = float(value)
+                    value = cast(value)
 
                     # 设置配置值
-                    config_obj = getattr(self, section)
-                    setattr(config_obj, field, value)
+                    setattr(getattr(self, section), field, value)
 
                     self._logger.debug(f"从环境变量加载配置: {env_var} = {value}")
 
@@ -181,24 +254,36 @@ class ProductionConfigManager:
             'cache.json': 'cache'
         }
 
-        for filename, section in config_files.items():
+        def load_one(filename: str) -> Optional[Dict[str, Any]]:
             config_path = self._config_dir / filename
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+            if not config_path.exists():
+                return None
+            return _loads_json(config_path.read_bytes())
 
-                    config_obj = getattr(self, section)
+        # 并发读取解析各配置文件，结果回到当前线程后再依次写入配置对象
+        with ThreadPoolExecutor(max_workers=len(config_files)) as executor:
+            futures = {filename: executor.submit(load_one, filename) for filename in config_files}
 
-                    # 更新配置对象
-                    for key, value in data.items():
-                        if hasattr(config_obj, key):
-                            setattr(config_obj, key, value)
+        for filename, section in config_files.items():
+            try:
+                data = futures[filename].result()
+                if data is None:
+                    continue
 
-                    self._logger.info(f"从文件加载配置: {filename}")
+                config_obj = getattr(self, section)
+                allowed_fields = self._allowed_fields[section]
 
-                except Exception as e:
-                    self._logger.error(f"加载配置文件失败: {filename}", exception=e)
+                # 更新配置对象
+                for key, value in data.items():
+                    if key in allowed_fields:
+                        setattr(config_obj, key, value)
+                    else:
+                        self._logger.warning(f"配置文件 {filename} 包含未知配置项: {key}")
+
+                self._logger.info(f"从文件加载配置: {filename}")
+
+            except Exception as e:
+                self._logger.error(f"加载配置文件失败: {filename}", exception=e)
 
     def save_to_files(self):
         """保存配置到文件"""
@@ -213,9 +298,34 @@ class ProductionConfigManager:
         for filename, config_obj in config_objects.items():
             config_path = self._config_dir / filename
             try:
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(asdict(config_obj), f, indent=2, ensure_ascii=False)
+                content = _dumps_json(_fast_asdict(config_obj))
+                if self._saved_contents.get(filename) == content and config_path.exists():
+                    continue
 
+                # 先写临时文件再原子替换，避免写入中断留下不完整的配置
+                temp_path = None
+                try:
+                    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self._config_dir,
+                                                     suffix='.tmp', delete=False) as f:
+                        temp_path = f.name
+                        f.write(content)
+                    # 临时文件创建时权限为 0600：沿用原文件权限，新文件使用 0644
+                    try:
+                        mode = stat.S_IMODE(os.stat(config_path).st_mode)
+                    except FileNotFoundError:
+                        mode = 0o644
+                    os.chmod(temp_path, mode)
+                    os.replace(temp_path, config_path)
+                except BaseException:
+                    # 替换未完成时清理临时文件
+                    if temp_path is not None:
+                        try:
+                            os.unlink(temp_path)
+                        except OSError:
+                            pass
+                    raise
+
+                self._saved_contents[filename] = content
                 self._logger.info(f"配置保存到文件: {filename}")
 
             except Exception as e:
@@ -228,11 +338,11 @@ class ProductionConfigManager:
             完整配置字典
         """
         return {
-            'security': asdict(self.security),
-            'performance': asdict(self.performance),
-            'monitoring': asdict(self.monitoring),
-            'database': asdict(self.database),
-            'cache': asdict(self.cache)
+            'security': _fast_asdict(self.security),
+            'performance': _fast_asdict(self.performance),
+            'monitoring': _fast_asdict(self.monitoring),
+            'database': _fast_asdict(self.database),
+            'cache': _fast_asdict(self.cache)
         }
 
     def validate_config(self) -> List[str]:
@@ -348,16 +458,26 @@ class ProductionConfigManager:
 
         self._logger.info("配置已针对生产环境优化")
 
+    def _config_versions(self) -> Tuple[int, ...]:
+        """获取各配置段的版本号"""
+        return (self.security._version, self.performance._version, self.monitoring._version,
+                self.database._version, self.cache._version)
+
     def get_config_summary(self) -> str:
-        """获取配置摘要
+        """获取配置摘要（配置未变更时直接返回缓存）
 
         Returns:
             配置摘要字符串
         """
+        versions = self._config_versions()
+        if self._summary_cache is not None and self._summary_cache[0] == versions:
+            return self._summary_cache[1]
+
         config_str = json.dumps(self.get_all_config(), sort_keys=True)
-        config_hash = hashlib.md5(config_str.encode()).hexdigest()[:8]
+        # 仅用于变更识别的指纹，直接生成4字节BLAKE2b摘要（8位十六进制）
+        config_hash = hashlib.blake2b(config_str.encode(), digest_size=4).hexdigest()
 
-        return (
+        summary = (
             f"生产环境配置摘要:\n"
             f"- 安全: 加密={self.security.api_key_encryption}, "
             f"限流={self.security.rate_limiting_enabled}\n"
@@ -372,9 +492,13 @@ class ProductionConfigManager:
             f"- 配置哈希: {config_hash}"
         )
 
+        self._summary_cache = (versions, summary)
+        return summary
+
 
 # 全局配置管理器实例
 _production_config_instance: Optional[ProductionConfigManager] = None
+_production_config_lock = threading.Lock()
 
 
 def get_production_config() -> ProductionConfigManager:
@@ -382,6 +506,8 @@ def get_production_config() -> ProductionConfigManager:
     global _production_config_instance
 
     if _production_config_instance is None:
-        _production_config_instance = ProductionConfigManager()
+        with _production_config_lock:
+            if _production_config_instance is None:
+                _production_config_instance = ProductionConfigManager()
 
     return _production_config_instance
\ No newline at end of file
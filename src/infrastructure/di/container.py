@@ -3,17 +3,37 @@
 提供统一的依赖管理和对象生命周期控制
 """
 
+import functools
 import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Type, TypeVar, Callable, Optional, List, Union
+from typing import Any, Dict, Type, TypeVar, Callable, Optional, List, Union, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import threading
 
+from ..utilities.dataclass_slots import add_slots
 
 T = TypeVar('T')
 
 
+@functools.lru_cache(maxsize=None)
+def _resolved_params(cls: type) -> Tuple[Tuple[str, Any, bool], ...]:
+    """获取构造函数参数 (名称, 类型注解, 是否有默认值)，按类型缓存
+
+    inspect.signature 开销较大，每个实现类型只解析一次。
+    """
+    signature = inspect.signature(cls.__init__)
+    parameters = list(signature.parameters.values())[1:]  # 跳过self参数
+    empty = inspect.Parameter.empty
+
+    params = []
+    for param in parameters:
+        if param.annotation is empty:
+            raise ValueError(f"构造函数参数 {param.name} 缺少类型注解")
+        params.append((param.name, param.annotation, param.default is not empty))
+    return tuple(params)
+
+
 class ServiceLifetime(Enum):
     """服务生命周期枚举"""
     SINGLETON = "singleton"    # 单例模式
@@ -21,6 +41,7 @@ class ServiceLifetime(Enum):
     SCOPED = "scoped"         # 作用域内单例
 
 
+@add_slots
 @dataclass
 class ServiceDescriptor:
     """服务描述符"""
@@ -75,7 +96,8 @@ class DependencyContainer(IDependencyContainer):
         self._singletons: Dict[Type, Any] = {}
         self._scoped_instances: Dict[Type, Any] = {}
         self._lock = threading.RLock()
-        self._resolving_stack: List[Type] = []  # 用于检测循环依赖
+        # 解析栈按线程隔离，用于检测循环依赖（列表保留路径，集合用于O(1)查重）
+        self._resolving = threading.local()
 
     def register_singleton(self, service_type: Type[T], implementation_type: Type[T] = None, factory: Callable[[], T] = None) -> None:
         """注册单例服务"""
@@ -87,6 +109,8 @@ class DependencyContainer(IDependencyContainer):
                 lifetime=ServiceLifetime.SINGLETON
             )
             self._services[service_type] = descriptor
+            # 重新注册时丢弃旧的单例，避免按类型直接读取单例表时取到过期实例
+            self._singletons.pop(service_type, None)
 
     def register_transient(self, service_type: Type[T], implementation_type: Type[T] = None, factory: Callable[[], T] = None) -> None:
         """注册瞬态服务"""
@@ -98,6 +122,8 @@ class DependencyContainer(IDependencyContainer):
                 lifetime=ServiceLifetime.TRANSIENT
             )
             self._services[service_type] = descriptor
+            # 重新注册时丢弃旧的单例，避免按类型直接读取单例表时取到过期实例
+            self._singletons.pop(service_type, None)
 
     def register_scoped(self, service_type: Type[T], implementation_type: Type[T] = None, factory: Callable[[], T] = None) -> None:
         """注册作用域服务"""
@@ -109,6 +135,8 @@ class DependencyContainer(IDependencyContainer):
                 lifetime=ServiceLifetime.SCOPED
             )
             self._services[service_type] = descriptor
+            # 重新注册时丢弃旧的单例，避免按类型直接读取单例表时取到过期实例
+            self._singletons.pop(service_type, None)
 
     def register_instance(self, service_type: Type[T], instance: T) -> None:
         """注册实例"""
@@ -130,10 +158,23 @@ class DependencyContainer(IDependencyContainer):
 
     def try_resolve(self, service_type: Type[T]) -> Optional[T]:
         """尝试解析服务，失败返回None"""
+        # 快速路径：已创建的单例无需加锁（dict.get 在GIL下是原子的）
+        instance = self._singletons.get(service_type)
+        if instance is not None:
+            descriptor = self._services.get(service_type)
+            if descriptor is not None and descriptor.lifetime is ServiceLifetime.SINGLETON:
+                return instance
+
+        # 未注册的服务同样无需加锁
+        if service_type not in self._services:
+            return None
+
+        resolving_stack, resolving_set = self._get_resolving_state()
+
         with self._lock:
             # 检查循环依赖
-            if service_type in self._resolving_stack:
-                cycle_path = " -> ".join([t.__name__ for t in self._resolving_stack])
+            if service_type in resolving_set:
+                cycle_path = " -> ".join([t.__name__ for t in resolving_stack])
                 raise ValueError(f"检测到循环依赖: {cycle_path} -> {service_type.__name__}")
 
             if service_type not in self._services:
@@ -142,27 +183,39 @@ class DependencyContainer(IDependencyContainer):
             descriptor = self._services[service_type]
 
             # 检查是否已有实例
-            if descriptor.lifetime == ServiceLifetime.SINGLETON:
+            if descriptor.lifetime is ServiceLifetime.SINGLETON:
                 if service_type in self._singletons:
                     return self._singletons[service_type]
-            elif descriptor.lifetime == ServiceLifetime.SCOPED:
+            elif descriptor.lifetime is ServiceLifetime.SCOPED:
                 if service_type in self._scoped_instances:
                     return self._scoped_instances[service_type]
 
             # 创建新实例
-            self._resolving_stack.append(service_type)
+            resolving_stack.append(service_type)
+            resolving_set.add(service_type)
             try:
                 instance = self._create_instance(descriptor)
 
                 # 缓存实例
-                if descriptor.lifetime == ServiceLifetime.SINGLETON:
+                if descriptor.lifetime is ServiceLifetime.SINGLETON:
                     self._singletons[service_type] = instance
-                elif descriptor.lifetime == ServiceLifetime.SCOPED:
+                elif descriptor.lifetime is ServiceLifetime.SCOPED:
                     self._scoped_instances[service_type] = instance
 
                 return instance
             finally:
-                self._resolving_stack.remove(service_type)
+                resolving_stack.pop()
+                resolving_set.discard(service_type)
+
+    def _get_resolving_state(self) -> Tuple[List[Type], set]:
+        """获取当前线程的解析栈与解析集合"""
+        state = self._resolving
+        try:
+            return state.stack, state.members
+        except AttributeError:
+            state.stack = []
+            state.members = set()
+            return state.stack, state.members
 
     def _create_instance(self, descriptor: ServiceDescriptor) -> Any:
         """创建实例"""
@@ -179,24 +232,16 @@ class DependencyContainer(IDependencyContainer):
         if implementation_type is None:
             raise ValueError(f"服务 {descriptor.service_type.__name__} 没有实现类型或工厂方法")
 
-        # 获取构造函数参数
-        constructor = implementation_type.__init__
-        signature = inspect.signature(constructor)
-        parameters = list(signature.parameters.values())[1:]  # 跳过self参数
-
-        # 解析依赖
+        # 解析依赖（构造函数参数已按类型缓存）
         args = []
-        for param in parameters:
-            if param.annotation == inspect.Parameter.empty:
-                raise ValueError(f"构造函数参数 {param.name} 缺少类型注解")
-
-            dependency = self.try_resolve(param.annotation)
+        for name, annotation, has_default in _resolved_params(implementation_type):
+            dependency = self.try_resolve(annotation)
             if dependency is None:
-                if param.default != inspect.Parameter.empty:
+                if has_default:
                     # 使用默认值
                     continue
                 else:
-                    raise ValueError(f"无法解析依赖 {param.annotation.__name__}")
+                    raise ValueError(f"无法解析依赖 {annotation.__name__}")
 
             args.append(dependency)
 
@@ -244,32 +289,40 @@ class ServiceScope:
 
 
 def autowired(container: IDependencyContainer):
-    """自动装配装饰器"""
+    """自动装配装饰器
+
+    装饰时生成专用的 __init__ 源码并编译，实例化时不再做任何参数检查。
+    """
     def decorator(cls):
         # 检查构造函数
         constructor = cls.__init__
         signature = inspect.signature(constructor)
         parameters = list(signature.parameters.values())[1:]  # 跳过self参数
 
-        original_init = cls.__init__
-
-        def new_init(self, *args, **kwargs):
-            # 如果提供了参数，直接使用
-            if args or kwargs:
-                original_init(self, *args, **kwargs)
-                return
-
-            # 自动解析依赖
+        namespace = {"_orig": constructor, "_resolve": container.resolve}
+        missing = next((param.name for param in parameters if param.annotation is inspect.Parameter.empty), None)
+        if missing is not None:
+            # 缺少类型注解时保持原行为：仅在自动装配时报错
+            namespace["_error"] = f"构造函数参数 {missing} 缺少类型注解"
+            auto_call = "raise ValueError(_error)"
+        else:
             resolved_args = []
-            for param in parameters:
-                if param.annotation == inspect.Parameter.empty:
-                    raise ValueError(f"构造函数参数 {param.name} 缺少类型注解")
-
-                dependency = container.resolve(param.annotation)
-                resolved_args.append(dependency)
-
-            original_init(self, *resolved_args)
-
+            for index, param in enumerate(parameters):
+                namespace[f"_T{index}"] = param.annotation
+                resolved_args.append(f"_resolve(_T{index})")
+            auto_call = f"_orig(self{''.join(', ' + arg for arg in resolved_args)})"
+
+        source = (
+            "def __init__(self, *args, **kwargs):\n"
+            "    if args or kwargs:\n"
+            "        return _orig(self, *args, **kwargs)\n"
+            f"    {auto_call}\n"
+        )
+        exec(source, namespace)
+
+        new_init = namespace["__init__"]
+        new_init.__qualname__ = f"{cls.__qualname__}.__init__"
+        new_init.__doc__ = constructor.__doc__
         cls.__init__ = new_init
         return cls
 
@@ -278,13 +331,17 @@ def autowired(container: IDependencyContainer):
 
 # 创建全局容器单例
 _container: Optional[DependencyContainer] = None
+_container_lock = threading.Lock()
 
 
 def get_container() -> DependencyContainer:
     """获取全局依赖注入容器"""
     global _container
+
     if _container is None:
-        _container = DependencyContainer()
+        with _container_lock:
+            if _container is None:
+                _container = DependencyContainer()
     return _container
 
 
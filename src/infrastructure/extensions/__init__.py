@@ -17,6 +17,8 @@ from .extension_points import (
     DocumentProcessingHook,
     QueryProcessingHook,
     ResponseEnhancementHook,
+    CachedExtensionHook,
+    memoize_hook,
     ExtensionPointRegistry,
     RAGExtensionPoints,
     get_extension_registry,
@@ -46,6 +48,8 @@ __all__ = [
     'DocumentProcessingHook',
     'QueryProcessingHook',
     'ResponseEnhancementHook',
+    'CachedExtensionHook',
+    'memoize_hook',
     'ExtensionPointRegistry',
     'RAGExtensionPoints',
     'get_extension_registry',
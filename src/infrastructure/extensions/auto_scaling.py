@@ -6,12 +6,14 @@
 import threading
 import time
 import psutil
-from typing import Dict, List, Any, Optional, Callable
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Deque
 from dataclasses import dataclass
 from enum import Enum
 
 from ..logging.logging_service import get_logging_service
 from ..monitoring.metrics_service import get_metrics_service
+from ..utilities.dataclass_slots import add_slots
 
 
 class ScalingAction(Enum):
@@ -30,6 +32,7 @@ class ResourceType(Enum):
     CUSTOM = "custom"
 
 
+@add_slots
 @dataclass
 class ResourceThreshold:
     """资源阈值配置"""
@@ -41,6 +44,7 @@ class ResourceThreshold:
     cooldown_period: int = 300      # 冷却期（秒）
 
 
+@add_slots
 @dataclass
 class ScalingEvent:
     """扩缩容事件"""
@@ -57,6 +61,9 @@ class ScalingEvent:
 class AutoScaler:
     """自动扩缩容管理器（简化版）"""
 
+    # 扩缩容历史保留的最大事件数
+    MAX_HISTORY_SIZE = 10000
+
     def __init__(self):
         """初始化自动扩缩容管理器"""
         self._logger = get_logging_service()
@@ -65,8 +72,8 @@ class AutoScaler:
         # 资源阈值配置
         self._thresholds: Dict[str, ResourceThreshold] = {}
 
-        # 扩缩容历史
-        self._scaling_history: List[ScalingEvent] = []
+        # 扩缩容历史（有界，超出上限时自动淘汰最旧事件）
+        self._scaling_history: Deque[ScalingEvent] = deque(maxlen=self.MAX_HISTORY_SIZE)
         self._last_scaling: Dict[str, float] = {}
 
         # 锁
@@ -95,7 +102,7 @@ class AutoScaler:
             扩缩容事件列表
         """
         with self._lock:
-            return self._scaling_history[-limit:]
+            return list(self._scaling_history)[-limit:]
 
     def get_current_stats(self) -> Dict[str, Any]:
         """获取当前状态统计
@@ -103,40 +110,44 @@ class AutoScaler:
         Returns:
             状态统计字典
         """
+        # 锁内只做快照，系统资源采样与结果构建均在锁外进行
         with self._lock:
-            try:
-                # 系统资源
-                cpu_percent = psutil.cpu_percent()
-                memory_percent = psutil.virtual_memory().percent
-
-                return {
-                    'system': {
-                        'cpu_usage': cpu_percent,
-                        'memory_usage': memory_percent,
-                        'timestamp': time.time()
-                    },
-                    'thresholds': {
-                        key: {
-                            'scale_up_threshold': th.scale_up_threshold,
-                            'scale_down_threshold': th.scale_down_threshold,
-                            'min_instances': th.min_instances,
-                            'max_instances': th.max_instances
-                        }
-                        for key, th in self._thresholds.items()
-                    },
-                    'scaling_events_count': len(self._scaling_history)
-                }
-            except Exception as e:
-                self._logger.error("获取系统统计失败", exception=e)
-                return {
-                    'system': {
-                        'cpu_usage': 0.0,
-                        'memory_usage': 0.0,
-                        'timestamp': time.time()
-                    },
-                    'thresholds': {},
-                    'scaling_events_count': 0
-                }
+            thresholds = tuple(self._thresholds.items())
+            events_count = len(self._scaling_history)
+
+        try:
+            # 系统资源（interval=None 为非阻塞采样）
+            cpu_percent = psutil.cpu_percent(interval=None)
+            memory_percent = psutil.virtual_memory().percent
+
+            return {
+                'system': {
+                    'cpu_usage': cpu_percent,
+                    'memory_usage': memory_percent,
+                    'timestamp': time.time()
+                },
+                'thresholds': {
+                    key: {
+                        'scale_up_threshold': th.scale_up_threshold,
+                        'scale_down_threshold': th.scale_down_threshold,
+                        'min_instances': th.min_instances,
+                        'max_instances': th.max_instances
+                    }
+                    for key, th in thresholds
+                },
+                'scaling_events_count': events_count
+            }
+        except Exception as e:
+            self._logger.error("获取系统统计失败", exception=e)
+            return {
+                'system': {
+                    'cpu_usage': 0.0,
+                    'memory_usage': 0.0,
+                    'timestamp': time.time()
+                },
+                'thresholds': {},
+                'scaling_events_count': 0
+            }
 
 
 # 全局自动扩缩容实例
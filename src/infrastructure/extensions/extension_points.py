@@ -3,29 +3,45 @@
 提供预定义的扩展点和钩子机制
 """
 
-from typing import Dict, List, Any, Callable, Optional, TypeVar, Generic
+from typing import Dict, List, Any, Callable, Optional, TypeVar, Generic, Tuple, Mapping, FrozenSet, DefaultDict, Sequence
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+import contextlib
+import copy
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+import json
+import sys
 import threading
 
-from .plugin_manager import get_plugin_manager
+from .plugin_manager import get_plugin_manager, is_single_threaded, _CALLBACK_FAILED
 from ..logging.logging_service import get_logging_service
+from ..utilities.dataclass_slots import add_slots
 
 
 T = TypeVar('T')
 
+# 未传入元数据时共享的只读空映射
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
 
-@dataclass
+
+@add_slots
+@dataclass(frozen=True)
 class ExtensionContext:
     """扩展上下文"""
     extension_point: str
     data: Dict[str, Any]
-    metadata: Dict[str, Any]
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_METADATA)
 
 
 class ExtensionHook(ABC, Generic[T]):
     """扩展钩子基类"""
 
+    __slots__ = ()
+
+    # 可信钩子执行时不做异常保护，子类确认 execute 不会抛出异常时可设为True
+    trusted: bool = False
+
     @abstractmethod
     def execute(self, context: ExtensionContext) -> T:
         """执行扩展钩子
@@ -42,6 +58,8 @@ class ExtensionHook(ABC, Generic[T]):
 class DocumentProcessingHook(ExtensionHook[Dict[str, Any]]):
     """文档处理扩展钩子"""
 
+    __slots__ = ()
+
     def execute(self, context: ExtensionContext) -> Dict[str, Any]:
         """执行文档处理扩展
 
@@ -58,6 +76,8 @@ class DocumentProcessingHook(ExtensionHook[Dict[str, Any]]):
 class QueryProcessingHook(ExtensionHook[Dict[str, Any]]):
     """查询处理扩展钩子"""
 
+    __slots__ = ()
+
     def execute(self, context: ExtensionContext) -> Dict[str, Any]:
         """执行查询处理扩展
 
@@ -74,6 +94,8 @@ class QueryProcessingHook(ExtensionHook[Dict[str, Any]]):
 class ResponseEnhancementHook(ExtensionHook[str]):
     """响应增强扩展钩子"""
 
+    __slots__ = ()
+
     def execute(self, context: ExtensionContext) -> str:
         """执行响应增强扩展
 
@@ -87,51 +109,149 @@ class ResponseEnhancementHook(ExtensionHook[str]):
         return context.data.get('response', '')
 
 
+# 缓存未命中标记（钩子结果本身可能为None）
+_MISSING = object()
+
+
+def _context_cache_key(context: ExtensionContext) -> Any:
+    """根据扩展上下文生成缓存键
+
+    数据值均可哈希时直接使用 (扩展点, 数据项集合)，否则回退为排序后的 JSON 文本。
+    """
+    try:
+        return context.extension_point, frozenset(context.data.items())
+    except TypeError:
+        return context.extension_point, json.dumps(context.data, sort_keys=True, default=str)
+
+
+class CachedExtensionHook(ExtensionHook[T]):
+    """带LRU缓存的扩展钩子包装器
+
+    仅适用于结果只取决于 context.data 的幂等钩子（如相关性评分、来源过滤），
+    相同数据再次触发时直接返回缓存结果。缓存保存结果的深拷贝并在每次命中时返回新的拷贝，
+    原样返回 context.data 的结果不缓存，避免调用方的数据在请求之间共享。
+    """
+
+    __slots__ = ('_hook', '_maxsize', '_cache', '_lock')
+
+    def __init__(self, hook: ExtensionHook[T], maxsize: int = 1024):
+        """初始化缓存钩子
+
+        Args:
+            hook: 被包装的扩展钩子
+            maxsize: 最大缓存条目数
+        """
+        self._hook = hook
+        self._maxsize = maxsize
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def execute(self, context: ExtensionContext) -> T:
+        """执行扩展钩子，命中缓存时直接返回"""
+        key = _context_cache_key(context)
+
+        with self._lock:
+            cached = self._cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                self._cache.move_to_end(key)
+        if cached is not _MISSING:
+            return copy.deepcopy(cached)
+
+        # 钩子在锁外执行
+        result = self._hook.execute(context)
+
+        # 结果就是调用方传入的数据时不缓存
+        if result is context.data:
+            return result
+
+        cached = copy.deepcopy(result)
+        with self._lock:
+            self._cache[key] = cached
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def clear_cache(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+
+def memoize_hook(maxsize: int = 1024) -> Callable[[ExtensionHook[T]], CachedExtensionHook[T]]:
+    """为幂等钩子添加结果缓存
+
+    用法: registry.register_hook('rag.relevance_scoring', memoize_hook(maxsize=512)(MyHook()))
+
+    Args:
+        maxsize: 最大缓存条目数
+
+    Returns:
+        将钩子包装为 CachedExtensionHook 的函数
+    """
+    def wrapper(hook: ExtensionHook[T]) -> CachedExtensionHook[T]:
+        return CachedExtensionHook(hook, maxsize)
+
+    return wrapper
+
+
+# 预定义扩展点
+_PREDEFINED_EXTENSION_POINTS: Tuple[str, ...] = tuple(sys.intern(name) for name in (
+    # 文档处理扩展点
+    'document.before_upload',               # 文档上传前
+    'document.after_upload',                # 文档上传后
+    'document.before_processing',           # 文档处理前
+    'document.after_processing',            # 文档处理后
+    'document.before_indexing',             # 文档索引前
+    'document.after_indexing',              # 文档索引后
+
+    # 查询处理扩展点
+    'query.before_processing',              # 查询处理前
+    'query.after_processing',               # 查询处理后
+    'query.before_retrieval',              # 检索前
+    'query.after_retrieval',               # 检索后
+    'query.before_generation',             # 生成前
+    'query.after_generation',              # 生成后
+
+    # 响应处理扩展点
+    'response.before_formatting',           # 响应格式化前
+    'response.after_formatting',            # 响应格式化后
+    'response.before_delivery',             # 响应交付前
+    'response.after_delivery',              # 响应交付后
+
+    # 系统级扩展点
+    'system.startup',                       # 系统启动
+    'system.shutdown',                      # 系统关闭
+    'system.error',                         # 系统错误
+    'system.maintenance',                   # 系统维护
+
+    # RAG特定扩展点
+    'rag.context_enhancement',              # 上下文增强
+    'rag.answer_validation',                # 答案验证
+    'rag.source_filtering',                 # 来源过滤
+    'rag.relevance_scoring',                # 相关性评分
+))
+# 驻留后的标准扩展点名称，字典查找时可直接按指针比较
+_EP: Dict[str, str] = {name: name for name in _PREDEFINED_EXTENSION_POINTS}
+_CANONICAL_EXTENSION_POINTS: FrozenSet[str] = frozenset(_PREDEFINED_EXTENSION_POINTS)
+
+
 class ExtensionPointRegistry:
     """扩展点注册表"""
 
-    def __init__(self):
-        """初始化扩展点注册表"""
+    def __init__(self, thread_safe: bool = True):
+        """初始化扩展点注册表
+
+        Args:
+            thread_safe: 是否加锁保护，单线程部署可设为False以省去加锁开销
+        """
         self._logger = get_logging_service()
         self._plugin_manager = get_plugin_manager()
-        self._lock = threading.RLock()
-
-        # 预定义扩展点
-        self._extension_points = {
-            # 文档处理扩展点
-            'document.before_upload': [],           # 文档上传前
-            'document.after_upload': [],            # 文档上传后
-            'document.before_processing': [],       # 文档处理前
-            'document.after_processing': [],        # 文档处理后
-            'document.before_indexing': [],         # 文档索引前
-            'document.after_indexing': [],          # 文档索引后
-
-            # 查询处理扩展点
-            'query.before_processing': [],          # 查询处理前
-            'query.after_processing': [],           # 查询处理后
-            'query.before_retrieval': [],          # 检索前
-            'query.after_retrieval': [],           # 检索后
-            'query.before_generation': [],         # 生成前
-            'query.after_generation': [],          # 生成后
-
-            # 响应处理扩展点
-            'response.before_formatting': [],       # 响应格式化前
-            'response.after_formatting': [],        # 响应格式化后
-            'response.before_delivery': [],         # 响应交付前
-            'response.after_delivery': [],          # 响应交付后
-
-            # 系统级扩展点
-            'system.startup': [],                   # 系统启动
-            'system.shutdown': [],                  # 系统关闭
-            'system.error': [],                     # 系统错误
-            'system.maintenance': [],               # 系统维护
-
-            # RAG特定扩展点
-            'rag.context_enhancement': [],          # 上下文增强
-            'rag.answer_validation': [],            # 答案验证
-            'rag.source_filtering': [],             # 来源过滤
-            'rag.relevance_scoring': [],            # 相关性评分
-        }
+        # 临界区内只调用插件管理器（持有其自身的锁），不会重入，使用普通锁即可
+        self._lock = threading.Lock() if thread_safe else contextlib.nullcontext()
+
+        # 钩子回调统一存储在插件管理器中，这里只记录 (钩子实例, 存储的回调) 用于取消注册和计数
+        self._hook_entries: DefaultDict[str, Tuple[Tuple[ExtensionHook, Callable], ...]] = defaultdict(tuple)
 
         self._logger.info("扩展点注册表初始化完成")
 
@@ -145,18 +265,14 @@ class ExtensionPointRegistry:
         Returns:
             是否成功注册
         """
+        # 外部来源（如 plugin.json）的名称驻留后与标准名称共享同一对象
+        extension_point = sys.intern(extension_point)
         with self._lock:
             try:
-                if extension_point not in self._extension_points:
-                    self._extension_points[extension_point] = []
-
-                self._extension_points[extension_point].append(hook)
-
-                # 同时注册到插件管理器
-                self._plugin_manager.register_extension_point(
-                    extension_point,
-                    lambda context: hook.execute(context)
+                callback = self._plugin_manager.register_extension_point(
+                    extension_point, hook.execute, trusted=hook.trusted
                 )
+                self._hook_entries[extension_point] += ((hook, callback),)
 
                 self._logger.info(f"注册扩展钩子成功: {extension_point}")
                 return True
@@ -177,10 +293,11 @@ class ExtensionPointRegistry:
         """
         with self._lock:
             try:
-                if extension_point in self._extension_points:
-                    hooks = self._extension_points[extension_point]
-                    if hook in hooks:
-                        hooks.remove(hook)
+                entries = self._hook_entries.get(extension_point, ())
+                for index, (registered_hook, callback) in enumerate(entries):
+                    if registered_hook == hook:
+                        self._plugin_manager.unregister_extension_point(extension_point, callback)
+                        self._hook_entries[extension_point] = entries[:index] + entries[index + 1:]
                         self._logger.info(f"取消注册扩展钩子成功: {extension_point}")
                         return True
 
@@ -193,7 +310,7 @@ class ExtensionPointRegistry:
     def execute_extension_point(self,
                               extension_point: str,
                               data: Dict[str, Any],
-                              metadata: Dict[str, Any] = None) -> List[Any]:
+                              metadata: Dict[str, Any] = None) -> Sequence[Any]:
         """执行扩展点
 
         Args:
@@ -202,42 +319,38 @@ class ExtensionPointRegistry:
             metadata: 扩展元数据
 
         Returns:
-            扩展执行结果列表
+            扩展执行结果列表（无钩子时为空元组）
         """
-        with self._lock:
-            try:
-                if extension_point not in self._extension_points:
-                    self._logger.warning(f"未知扩展点: {extension_point}")
-                    return []
+        try:
+            # 无锁读取当前回调快照，回调在锁外执行，不会阻塞注册
+            callbacks = self._plugin_manager.get_extension_callbacks(extension_point)
 
-                # 创建扩展上下文
-                context = ExtensionContext(
-                    extension_point=extension_point,
-                    data=data,
-                    metadata=metadata or {}
-                )
+            # 快速路径：没有任何钩子时不创建上下文
+            if not callbacks:
+                if extension_point not in _CANONICAL_EXTENSION_POINTS and extension_point not in self._hook_entries:
+                    self._logger.warning(f"未知扩展点: {extension_point}")
+                return ()
 
-                results = []
-                hooks = self._extension_points[extension_point]
+            # 创建扩展上下文
+            context = ExtensionContext(
+                extension_point=extension_point,
+                data=data,
+                metadata=metadata if metadata is not None else _EMPTY_METADATA
+            )
 
-                for hook in hooks:
-                    try:
-                        result = hook.execute(context)
-                        results.append(result)
-                    except Exception as e:
-                        self._logger.error(f"执行扩展钩子失败: {extension_point}", exception=e)
+            results = []
 
-                # 同时调用插件管理器的扩展点
-                plugin_results = self._plugin_manager.call_extension_point(
-                    extension_point, context
-                )
-                results.extend(plugin_results)
+            # 异常保护已在注册时包装，循环内无需 try/except
+            for callback in callbacks:
+                result = callback(context)
+                if result is not _CALLBACK_FAILED:
+                    results.append(result)
 
-                return results
+            return results
 
-            except Exception as e:
-                self._logger.error(f"执行扩展点失败: {extension_point}", exception=e)
-                return []
+        except Exception as e:
+            self._logger.error(f"执行扩展点失败: {extension_point}", exception=e)
+            return ()
 
     def get_extension_points(self) -> List[str]:
         """获取所有扩展点名称
@@ -245,8 +358,9 @@ class ExtensionPointRegistry:
         Returns:
             扩展点名称列表
         """
-        with self._lock:
-            return list(self._extension_points.keys())
+        return list(_PREDEFINED_EXTENSION_POINTS) + [
+            name for name in list(self._hook_entries) if name not in _CANONICAL_EXTENSION_POINTS
+        ]
 
     def get_hook_count(self, extension_point: str) -> int:
         """获取扩展点的钩子数量
@@ -257,8 +371,7 @@ class ExtensionPointRegistry:
         Returns:
             钩子数量
         """
-        with self._lock:
-            return len(self._extension_points.get(extension_point, []))
+        return len(self._hook_entries.get(extension_point, ()))
 
 
 class RAGExtensionPoints:
@@ -273,6 +386,29 @@ class RAGExtensionPoints:
         self._registry = registry or get_extension_registry()
         self._logger = get_logging_service()
 
+    def _run(self, extension_point: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """执行扩展点并将字典结果合并回数据
+
+        Args:
+            extension_point: 扩展点名称
+            payload: 传入并被更新的数据
+
+        Returns:
+            合并后的数据
+        """
+        results = self._registry.execute_extension_point(extension_point, payload)
+
+        # 合并结果（跳过原样返回传入数据的钩子，避免自我 update）；普通 dict
+        # 用类型指针比较快速判断，仅其他类型才回退到 isinstance 检查 dict 子类
+        for result in results:
+            if type(result) is dict:
+                if result is not payload:
+                    payload.update(result)
+            elif result is not payload and isinstance(result, dict):
+                payload.update(result)
+
+        return payload
+
     def before_document_upload(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """文档上传前扩展点
 
@@ -282,18 +418,7 @@ class RAGExtensionPoints:
         Returns:
             处理后的文档数据
         """
-        results = self._registry.execute_extension_point(
-            'document.before_upload',
-            document_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    document_data.update(result)
-
-        return document_data
+        return self._run(_EP['document.before_upload'], document_data)
 
     def after_document_upload(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """文档上传后扩展点
@@ -304,18 +429,7 @@ class RAGExtensionPoints:
         Returns:
             处理后的文档数据
         """
-        results = self._registry.execute_extension_point(
-            'document.after_upload',
-            document_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    document_data.update(result)
-
-        return document_data
+        return self._run(_EP['document.after_upload'], document_data)
 
     def before_query_processing(self, query_data: Dict[str, Any]) -> Dict[str, Any]:
         """查询处理前扩展点
@@ -326,18 +440,7 @@ class RAGExtensionPoints:
         Returns:
             处理后的查询数据
         """
-        results = self._registry.execute_extension_point(
-            'query.before_processing',
-            query_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    query_data.update(result)
-
-        return query_data
+        return self._run(_EP['query.before_processing'], query_data)
 
     def after_query_processing(self, query_data: Dict[str, Any]) -> Dict[str, Any]:
         """查询处理后扩展点
@@ -348,18 +451,7 @@ class RAGExtensionPoints:
         Returns:
             处理后的查询数据
         """
-        results = self._registry.execute_extension_point(
-            'query.after_processing',
-            query_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    query_data.update(result)
-
-        return query_data
+        return self._run(_EP['query.after_processing'], query_data)
 
     def enhance_context(self, context_data: Dict[str, Any]) -> Dict[str, Any]:
         """上下文增强扩展点
@@ -370,18 +462,7 @@ class RAGExtensionPoints:
         Returns:
             增强后的上下文数据
         """
-        results = self._registry.execute_extension_point(
-            'rag.context_enhancement',
-            context_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    context_data.update(result)
-
-        return context_data
+        return self._run(_EP['rag.context_enhancement'], context_data)
 
     def validate_answer(self, answer_data: Dict[str, Any]) -> Dict[str, Any]:
         """答案验证扩展点
@@ -392,18 +473,7 @@ class RAGExtensionPoints:
         Returns:
             验证后的答案数据
         """
-        results = self._registry.execute_extension_point(
-            'rag.answer_validation',
-            answer_data
-        )
-
-        # 合并结果
-        if results:
-            for result in results:
-                if isinstance(result, dict):
-                    answer_data.update(result)
-
-        return answer_data
+        return self._run(_EP['rag.answer_validation'], answer_data)
 
 
 # 全局扩展点注册表实例
@@ -418,11 +488,22 @@ def get_extension_registry() -> ExtensionPointRegistry:
     if _extension_registry_instance is None:
         with _extension_registry_lock:
             if _extension_registry_instance is None:
-                _extension_registry_instance = ExtensionPointRegistry()
+                _extension_registry_instance = ExtensionPointRegistry(thread_safe=not is_single_threaded())
 
     return _extension_registry_instance
 
 
+_rag_extensions_instance: Optional[RAGExtensionPoints] = None
+_rag_extensions_lock = threading.Lock()
+
+
 def get_rag_extensions() -> RAGExtensionPoints:
-    """获取RAG扩展点实例"""
-    return RAGExtensionPoints()
\ No newline at end of file
+    """获取RAG扩展点单例实例"""
+    global _rag_extensions_instance
+
+    if _rag_extensions_instance is None:
+        with _rag_extensions_lock:
+            if _rag_extensions_instance is None:
+                _rag_extensions_instance = RAGExtensionPoints()
+
+    return _rag_extensions_instance
\ No newline at end of file
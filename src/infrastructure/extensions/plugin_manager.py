@@ -3,18 +3,38 @@
 提供插件热加载、生命周期管理和扩展点支持
 """
 
-import importlib
-import inspect
+import contextlib
+import functools
 import threading
 import os
 import sys
-from typing import Dict, List, Any, Optional, Type, Callable
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Type, Callable, Tuple, DefaultDict
 from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
 
+try:
+    import orjson  # 可选依赖，未安装时回退到标准库 json
+except ImportError:
+    orjson = None
+
 from ..logging.logging_service import get_logging_service, ILoggingService
 from ..monitoring.metrics_service import get_metrics_service
+from ..utilities.dataclass_slots import add_slots
+
+
+# 受保护回调执行失败时的返回标记，不计入扩展点结果
+_CALLBACK_FAILED = object()
+
+
+def _guarded_call(callback: Callable, logger: ILoggingService, error_message: str, *args, **kwargs) -> Any:
+    """执行回调并捕获异常，失败时记录日志并返回 _CALLBACK_FAILED"""
+    try:
+        return callback(*args, **kwargs)
+    except Exception as e:
+        logger.error(error_message, exception=e)
+        return _CALLBACK_FAILED
 
 
 class PluginStatus(Enum):
@@ -27,6 +47,7 @@ class PluginStatus(Enum):
     DISABLED = "disabled"
 
 
+@add_slots
 @dataclass
 class PluginInfo:
     """插件信息"""
@@ -47,6 +68,8 @@ class PluginInfo:
 class Plugin(ABC):
     """插件基础类"""
 
+    __slots__ = ('_info', '_manager')
+
     def __init__(self):
         self._info: Optional[PluginInfo] = None
         self._manager: Optional['PluginManager'] = None
@@ -86,12 +109,14 @@ class PluginManager:
 
     def __init__(self,
                  plugin_dirs: List[str] = None,
-                 logger_service: Optional[ILoggingService] = None):
+                 logger_service: Optional[ILoggingService] = None,
+                 thread_safe: bool = True):
         """初始化插件管理器
 
         Args:
             plugin_dirs: 插件目录列表
             logger_service: 日志服务
+            thread_safe: 是否加锁保护，单线程部署可设为False以省去加锁开销
         """
         self._logger = logger_service or get_logging_service()
         self._metrics = get_metrics_service()
@@ -99,8 +124,19 @@ class PluginManager:
         self._plugin_dirs = plugin_dirs or ["plugins", "extensions"]
         self._plugins: Dict[str, Plugin] = {}
         self._plugin_infos: Dict[str, PluginInfo] = {}
-        self._extension_points: Dict[str, List[Callable]] = {}
-        self._lock = threading.RLock()
+        # 扩展点回调存储（扩展点注册表的钩子也注册于此），写时复制，读取无需加锁
+        self._extension_points: DefaultDict[str, Tuple[Callable, ...]] = defaultdict(tuple)
+        # 插件的 initialize/start/stop/cleanup 在锁内执行，可能通过 _manager 回调本管理器，
+        # unload_plugin 也会调用 stop_plugin，因此必须使用可重入锁
+        self._lock = threading.RLock() if thread_safe else contextlib.nullcontext()
+
+        # 插件发现缓存：目录 -> (目录mtime, {子目录路径: 子目录mtime}, [(插件路径, 插件名)])，
+        # 目录及各子目录内容不变时跳过扫描（子目录中新增/删除 __init__.py 只改变子目录的mtime）
+        self._discover_cache: Dict[str, Tuple[int, Dict[str, int], List[Tuple[str, str]]]] = {}
+        # 插件信息缓存：插件路径 -> (plugin.json mtime, 插件信息)，配置未修改时不重复解析
+        self._plugin_info_cache: Dict[str, Tuple[int, PluginInfo]] = {}
+        # 插件模块源文件mtime，未修改时不重新加载模块
+        self._module_mtimes: Dict[str, int] = {}
 
         self._logger.info("插件管理器初始化完成")
 
@@ -114,27 +150,25 @@ class PluginManager:
 
         with self._lock:
             for plugin_dir in self._plugin_dirs:
-                if not os.path.exists(plugin_dir):
+                try:
+                    dir_mtime = os.stat(plugin_dir).st_mtime_ns
+                except OSError:
                     continue
 
                 try:
-                    for item in os.listdir(plugin_dir):
-                        item_path = os.path.join(plugin_dir, item)
-
-                        # 检查Python包
-                        if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, "__init__.py")):
-                            plugin_info = self._load_plugin_info(item_path, item)
-                            if plugin_info:
-                                discovered.append(plugin_info)
-                                self._plugin_infos[plugin_info.name] = plugin_info
-
-                        # 检查单文件插件
-                        elif item.endswith(".py") and not item.startswith("__"):
-                            plugin_name = item[:-3]  # 移除.py扩展名
-                            plugin_info = self._load_plugin_info(item_path, plugin_name)
-                            if plugin_info:
-                                discovered.append(plugin_info)
-                                self._plugin_infos[plugin_info.name] = plugin_info
+                    cached = self._discover_cache.get(plugin_dir)
+                    if (cached is not None and cached[0] == dir_mtime
+                            and self._subdirs_unchanged(cached[1])):
+                        candidates = cached[2]
+                    else:
+                        subdir_mtimes, candidates = self._scan_plugin_dir(plugin_dir)
+                        self._discover_cache[plugin_dir] = (dir_mtime, subdir_mtimes, candidates)
+
+                    for item_path, plugin_name in candidates:
+                        plugin_info = self._load_plugin_info(item_path, plugin_name)
+                        if plugin_info:
+                            discovered.append(plugin_info)
+                            self._plugin_infos[plugin_info.name] = plugin_info
 
                 except Exception as e:
                     self._logger.error(f"发现插件失败: {plugin_dir}", exception=e)
@@ -371,20 +405,57 @@ class PluginManager:
                 if info.status == PluginStatus.ACTIVE
             ]
 
-    def register_extension_point(self, name: str, callback: Callable):
+    def register_extension_point(self, name: str, callback: Callable, trusted: bool = False) -> Callable:
         """注册扩展点
 
         Args:
             name: 扩展点名称
             callback: 回调函数
+            trusted: 是否为可信回调；可信回调不做异常保护，必须保证不抛出异常
+
+        Returns:
+            实际存储的回调（用于取消注册）
         """
-        with self._lock:
-            if name not in self._extension_points:
-                self._extension_points[name] = []
+        name = sys.intern(name)
+        if not trusted:
+            # 非可信回调在注册时一次性包装异常保护，调用循环中无需 try/except
+            callback = functools.partial(_guarded_call, callback, self._logger, f"扩展点回调失败: {name}")
 
-            self._extension_points[name].append(callback)
+        with self._lock:
+            self._extension_points[name] += (callback,)
             self._logger.debug(f"注册扩展点: {name}")
 
+        return callback
+
+    def unregister_extension_point(self, name: str, callback: Callable) -> bool:
+        """取消注册扩展点回调
+
+        Args:
+            name: 扩展点名称
+            callback: register_extension_point 返回的回调
+
+        Returns:
+            是否成功取消注册
+        """
+        with self._lock:
+            callbacks = self._extension_points.get(name, ())
+            for index, registered in enumerate(callbacks):
+                if registered is callback:
+                    self._extension_points[name] = callbacks[:index] + callbacks[index + 1:]
+                    return True
+            return False
+
+    def get_extension_callbacks(self, name: str) -> Tuple[Callable, ...]:
+        """获取扩展点回调快照（无锁）
+
+        Args:
+            name: 扩展点名称
+
+        Returns:
+            回调函数元组
+        """
+        return self._extension_points.get(name, ())
+
     def call_extension_point(self, name: str, *args, **kwargs) -> List[Any]:
         """调用扩展点
 
@@ -396,37 +467,105 @@ class PluginManager:
         Returns:
             回调函数返回值列表
         """
-        with self._lock:
-            results = []
+        # 无锁读取回调快照，回调在锁外执行
+        results = []
 
-            callbacks = self._extension_points.get(name, [])
-            for callback in callbacks:
-                try:
-                    result = callback(*args, **kwargs)
-                    results.append(result)
-                except Exception as e:
-                    self._logger.error(f"扩展点回调失败: {name}", exception=e)
+        callbacks = self._extension_points.get(name, ())
+        for callback in callbacks:
+            result = callback(*args, **kwargs)
+            if result is not _CALLBACK_FAILED:
+                results.append(result)
+
+        return results
+
+    @staticmethod
+    def _subdirs_unchanged(subdir_mtimes: Dict[str, int]) -> bool:
+        """检查上次扫描时各子目录的mtime是否未变化"""
+        for path, mtime in subdir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan_plugin_dir(self, plugin_dir: str) -> Tuple[Dict[str, int], List[Tuple[str, str]]]:
+        """扫描插件目录
 
-            return results
+        Args:
+            plugin_dir: 插件目录
+
+        Returns:
+            ({子目录路径: 子目录mtime}, [(插件路径, 插件名)])
+        """
+        subdir_mtimes: Dict[str, int] = {}
+        candidates = []
+        # scandir 在读取目录时即获得条目类型，无需再逐项 stat
+        with os.scandir(plugin_dir) as entries:
+            for entry in entries:
+                item = entry.name
+
+                # 检查Python包（记录子目录mtime，之后新增 __init__.py 时能重新扫描）
+                if entry.is_dir():
+                    subdir_mtimes[entry.path] = entry.stat().st_mtime_ns
+                    if os.path.exists(os.path.join(entry.path, "__init__.py")):
+                        candidates.append((entry.path, item))
+
+                # 检查单文件插件
+                elif item.endswith(".py") and not item.startswith("__"):
+                    candidates.append((entry.path, item[:-3]))  # 移除.py扩展名
+
+        return subdir_mtimes, candidates
 
     def _load_plugin_info(self, plugin_path: str, plugin_name: str) -> Optional[PluginInfo]:
-        """加载插件信息
+        """加载插件信息（plugin.json 未修改时复用缓存）
 
         Args:
             plugin_path: 插件路径
             plugin_name: 插件名称
 
+        Returns:
+            插件信息或None
+        """
+        config_file = os.path.join(plugin_path, "plugin.json")
+        try:
+            config_mtime = os.stat(config_file).st_mtime_ns
+        except OSError:
+            config_file = None
+            config_mtime = -1  # 无配置文件（或单文件插件）
+
+        cached = self._plugin_info_cache.get(plugin_path)
+        if cached is not None and cached[0] == config_mtime:
+            return cached[1]
+
+        plugin_info = self._parse_plugin_info(plugin_path, plugin_name, config_file)
+        if plugin_info:
+            self._plugin_info_cache[plugin_path] = (config_mtime, plugin_info)
+        return plugin_info
+
+    def _parse_plugin_info(self, plugin_path: str, plugin_name: str,
+                           config_file: Optional[str]) -> Optional[PluginInfo]:
+        """解析插件信息
+
+        Args:
+            plugin_path: 插件路径
+            plugin_name: 插件名称
+            config_file: plugin.json 路径，不存在时为None
+
         Returns:
             插件信息或None
         """
         try:
             # 尝试加载插件配置
-            config_file = os.path.join(plugin_path, "plugin.json") if os.path.isdir(plugin_path) else None
+            if config_file:
+                with open(config_file, 'rb') as f:
+                    raw = f.read()
 
-            if config_file and os.path.exists(config_file):
-                import json
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                if orjson is not None:
+                    config = orjson.loads(raw)
+                else:
+                    import json
+                    config = json.loads(raw)
 
                 return PluginInfo(
                     name=config.get('name', plugin_name),
@@ -480,6 +619,9 @@ class PluginManager:
         Returns:
             插件模块或None
         """
+        # 仅在实际加载插件时才需要 importlib
+        import importlib
+
         try:
             # 添加插件目录到路径
             for plugin_dir in self._plugin_dirs:
@@ -489,17 +631,38 @@ class PluginManager:
             # 动态导入
             module_name = f"plugins.{plugin_name}" if "plugins" in self._plugin_dirs else plugin_name
 
-            if module_name in sys.modules:
-                # 重新加载模块
-                importlib.reload(sys.modules[module_name])
-                return sys.modules[module_name]
+            module = sys.modules.get(module_name)
+            if module is None:
+                module = importlib.import_module(module_name)
+            elif self._module_mtimes.get(module_name) != self._get_module_mtime(module):
+                # 源文件已修改（或来源未知）时才重新加载模块
+                module = importlib.reload(module)
             else:
-                return importlib.import_module(module_name)
+                return module
+
+            self._module_mtimes[module_name] = self._get_module_mtime(module)
+            return module
 
         except Exception as e:
             self._logger.error(f"导入插件模块失败: {plugin_name}", exception=e)
             return None
 
+    @staticmethod
+    def _get_module_mtime(module) -> Optional[int]:
+        """获取模块源文件的修改时间，无法获取时返回None"""
+        module_file = getattr(module, '__file__', None)
+        if not module_file:
+            return None
+        try:
+            return os.stat(module_file).st_mtime_ns
+        except OSError:
+            return None
+
+
+def is_single_threaded() -> bool:
+    """是否声明为单线程部署（环境变量 WEB_RAG_SINGLE_THREAD=1）"""
+    return os.getenv("WEB_RAG_SINGLE_THREAD") == "1"
+
 
 # 全局插件管理器实例
 _plugin_manager_instance: Optional[PluginManager] = None
@@ -513,6 +676,6 @@ def get_plugin_manager() -> PluginManager:
     if _plugin_manager_instance is None:
         with _plugin_manager_lock:
             if _plugin_manager_instance is None:
-                _plugin_manager_instance = PluginManager()
+                _plugin_manager_instance = PluginManager(thread_safe=not is_single_threaded())
 
     return _plugin_manager_instance
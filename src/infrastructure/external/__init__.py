@@ -9,8 +9,13 @@ from .interfaces import (
     EmbeddingResult,
     DocumentChunk,
     SearchResult,
+    MessageBatch,
+    ROLE_CODES,
+    texts_of,
+    content_digest,
 
     # 服务接口
+    IConnectedService,
     ILLMService,
     IEmbeddingService,
     IVectorStoreService,
@@ -29,6 +34,36 @@ from .interfaces import (
     HealthCheckException
 )
 
+from .embedding_utils import (
+    EMBEDDING_DTYPE,
+    QUANTIZATION_TYPES,
+    as_embedding_array,
+    quantize_embeddings,
+    dequantize_embeddings
+)
+
+from .async_bridge import iterate_sync, run_sync
+
+from .mixins import (
+    IndexHandleCacheMixin,
+    ConversationHashCacheMixin,
+    CircuitBreakerMixin
+)
+
+from .search_utils import (
+    topk,
+    search_embeddings
+)
+
+from .rate_limiter import InMemoryRateLimiter
+
+from .semantic_cache import (
+    ISemanticCache,
+    LSHSemanticCache,
+    SemanticCachedVectorStore,
+    SemanticCachedLLMService
+)
+
 __all__ = [
     'ModelStatus',
     'ModelInfo',
@@ -37,6 +72,11 @@ __all__ = [
     'EmbeddingResult',
     'DocumentChunk',
     'SearchResult',
+    'MessageBatch',
+    'ROLE_CODES',
+    'texts_of',
+    'content_digest',
+    'IConnectedService',
     'ILLMService',
     'IEmbeddingService',
     'IVectorStoreService',
@@ -50,5 +90,22 @@ __all__ = [
     'EmbeddingServiceException',
     'VectorStoreException',
     'RateLimitException',
-    'HealthCheckException'
+    'HealthCheckException',
+    'EMBEDDING_DTYPE',
+    'QUANTIZATION_TYPES',
+    'as_embedding_array',
+    'quantize_embeddings',
+    'dequantize_embeddings',
+    'run_sync',
+    'iterate_sync',
+    'IndexHandleCacheMixin',
+    'ConversationHashCacheMixin',
+    'CircuitBreakerMixin',
+    'topk',
+    'search_embeddings',
+    'InMemoryRateLimiter',
+    'ISemanticCache',
+    'LSHSemanticCache',
+    'SemanticCachedVectorStore',
+    'SemanticCachedLLMService'
 ]
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+同步/异步桥接
+外部服务以异步方法为准，同步方法通过后台事件循环执行对应的协程
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterable, AsyncIterator, Coroutine, Iterator, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+# 异步迭代结束标记
+_EXHAUSTED = object()
+
+# 同步调用共享的后台事件循环（延迟创建）
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_bridge_loop() -> asyncio.AbstractEventLoop:
+    """获取同步桥接使用的后台事件循环
+
+    循环运行在守护线程中，所有同步调用共享同一循环，
+    实现类在其中创建的连接池等资源可以跨调用复用。
+    """
+    global _loop, _loop_thread
+
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="external-service-loop",
+                    daemon=True
+                )
+                thread.start()
+                _loop_thread = thread
+                _loop = loop
+    return _loop
+
+
+def _ensure_off_loop() -> asyncio.AbstractEventLoop:
+    """获取后台事件循环，当前线程正是循环线程时抛出异常
+
+    在循环线程中同步等待提交给同一循环的协程会永久阻塞（如异步方法内部调用了同步方法）。
+    """
+    loop = get_bridge_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("不能在后台事件循环中调用同步方法，请改为 await 对应的异步方法")
+    return loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """在同步代码中执行协程并等待结果
+
+    协程提交到后台事件循环执行，因此在已有事件循环的线程中调用也不会报错
+    （但会阻塞调用线程，异步代码应直接 await 异步方法）。
+
+    Args:
+        coro: 协程对象
+
+    Returns:
+        协程的返回值
+
+    Raises:
+        RuntimeError: 在后台事件循环线程中调用时
+    """
+    try:
+        loop = _ensure_off_loop()
+    except RuntimeError:
+        coro.close()
+        raise
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def _next_item(iterator: AsyncIterator[T]) -> Any:
+    """获取异步迭代器的下一项，结束时返回 _EXHAUSTED"""
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+def iterate_sync(iterable: AsyncIterable[T]) -> Iterator[T]:
+    """在同步代码中逐项消费异步可迭代对象（如流式输出的异步生成器）
+
+    每一项都在后台事件循环中取得，调用方提前结束迭代时关闭异步生成器。
+
+    Args:
+        iterable: 异步可迭代对象
+
+    Returns:
+        同步迭代器
+
+    Raises:
+        RuntimeError: 在后台事件循环线程中迭代时
+    """
+    loop = _ensure_off_loop()
+    iterator = iterable.__aiter__()
+    try:
+        while True:
+            item = asyncio.run_coroutine_threadsafe(_next_item(iterator), loop).result()
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, 'aclose', None)
+        if aclose is not None:
+            asyncio.run_coroutine_threadsafe(aclose(), loop).result()
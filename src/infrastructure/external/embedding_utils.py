@@ -0,0 +1,71 @@
+"""
+嵌入向量工具
+嵌入统一使用连续的 float32 numpy 数组 (N, d) 表示，便于零拷贝传给向量库
+"""
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+
+# 嵌入向量的标准数据类型
+EMBEDDING_DTYPE = np.float32
+
+# 支持的嵌入量化类型（pq 需要训练码本，由向量库在建索引时完成）
+QUANTIZATION_TYPES = ('float32', 'float16', 'int8', 'pq')
+
+# int8 对称量化的最大量化值
+_INT8_MAX = 127
+
+
+def as_embedding_array(vectors: Any, dtype: Any = EMBEDDING_DTYPE) -> np.ndarray:
+    """将嵌入向量转换为连续数组
+
+    已是目标类型的连续数组时不复制，列表输入（如 API 返回的 JSON）在此一次性转换。
+
+    Args:
+        vectors: 嵌入向量（数组或嵌套列表）
+        dtype: 目标数据类型，默认 float32
+
+    Returns:
+        连续数组
+    """
+    return np.ascontiguousarray(vectors, dtype=dtype)
+
+
+def quantize_embeddings(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[float]]:
+    """量化嵌入向量
+
+    float16 直接转换，int8 使用对称标量量化（value = round(x / scale)）。
+
+    Args:
+        vectors: float32 嵌入数组
+        dtype: 目标类型 ('float32'、'float16' 或 'int8')
+
+    Returns:
+        (量化后的数组, int8 量化的缩放系数；其他类型为 None)
+    """
+    if dtype == 'float32':
+        return as_embedding_array(vectors), None
+    if dtype == 'float16':
+        return as_embedding_array(vectors, np.float16), None
+    if dtype == 'int8':
+        max_abs = float(np.abs(vectors).max()) if vectors.size else 0.0
+        scale = max_abs / _INT8_MAX if max_abs > 0 else 1.0
+        return np.rint(vectors / scale).astype(np.int8), scale
+    raise ValueError(f"不支持的量化类型: {dtype}")
+
+
+def dequantize_embeddings(vectors: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
+    """将量化后的嵌入还原为 float32 数组
+
+    Args:
+        vectors: 量化后的数组
+        scale: int8 量化的缩放系数
+
+    Returns:
+        float32 数组
+    """
+    if scale is None:
+        return as_embedding_array(vectors)
+    return vectors.astype(EMBEDDING_DTYPE) * EMBEDDING_DTYPE(scale)
@@ -4,10 +4,47 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union, Tuple
-from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterator, List, Optional, Union, Tuple
+from dataclasses import dataclass, field
+from hashlib import blake2b
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import os
+import sys
+
+import numpy as np
+
+try:
+    import xxhash  # 可选依赖，未安装时回退到 hashlib.blake2b
+except ImportError:
+    xxhash = None
+
+from ..utilities.dataclass_slots import add_slots
+from .async_bridge import iterate_sync, run_sync
+from .embedding_utils import EMBEDDING_DTYPE, as_embedding_array, quantize_embeddings
+
+
+# 批量嵌入的默认并发数，可通过环境变量调整（兼容 Ollama 的 OLLAMA_NUM_PARALLEL）
+DEFAULT_EMBEDDING_CONCURRENCY = int(
+    os.getenv("EMBEDDING_MAX_CONCURRENCY") or os.getenv("OLLAMA_NUM_PARALLEL") or 4
+)
+
+# 批量搜索默认实现的最大线程数
+_BATCH_SEARCH_WORKERS = 4
+
+
+def content_digest(content: str) -> int:
+    """计算文本内容的64位哈希（优先使用 xxhash，未安装时回退到 blake2b）"""
+    data = content.encode('utf-8')
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), 'little')
+
+
+def _intern(value: Any) -> Any:
+    """驻留重复出现的短字符串（角色、模型名、来源等），相同取值的对象共享同一字符串"""
+    return sys.intern(value) if type(value) is str else value
 
 
 class ModelStatus(Enum):
@@ -18,6 +55,7 @@ class ModelStatus(Enum):
     RATE_LIMITED = "rate_limited"
 
 
+@add_slots
 @dataclass
 class ModelInfo:
     """模型信息"""
@@ -29,17 +67,34 @@ class ModelInfo:
     cost_per_token: Optional[float] = None
     rate_limit: Optional[Dict[str, int]] = None
 
+    def __post_init__(self):
+        self.provider = _intern(self.provider)
 
-@dataclass
+
+@add_slots
+@dataclass(frozen=True)
 class ChatMessage:
     """聊天消息"""
     role: str  # "user", "assistant", "system"
     content: str
     timestamp: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    content_hash: Optional[int] = field(default=None, compare=False, repr=False)  # 内容哈希，首次 digest() 时计算
 
+    def __post_init__(self):
+        object.__setattr__(self, 'role', _intern(self.role))
 
-@dataclass
+    def digest(self) -> int:
+        """内容的64位哈希（首次调用时计算并缓存），用于判断消息是否需要重新嵌入"""
+        content_hash = self.content_hash
+        if content_hash is None:
+            content_hash = content_digest(self.content)
+            object.__setattr__(self, 'content_hash', content_hash)
+        return content_hash
+
+
+@add_slots
+@dataclass(frozen=True)
 class ChatResponse:
     """聊天响应"""
     content: str
@@ -48,17 +103,52 @@ class ChatResponse:
     finish_reason: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
+    def __post_init__(self):
+        object.__setattr__(self, 'model_used', _intern(self.model_used))
+
 
+@add_slots
 @dataclass
 class EmbeddingResult:
     """嵌入结果"""
-    vectors: List[List[float]]
+    vectors: np.ndarray  # 形状 (N, d) 的数组，默认 float32
     model_used: str
     tokens_used: Optional[int] = None
     metadata: Optional[Dict[str, Any]] = None
+    dtype: str = 'float32'  # 'float32'、'float16' 或 'int8'
+    scale: Optional[float] = None  # int8 量化的缩放系数
 
+    def __post_init__(self):
+        # 实现类返回嵌套列表时在边界处一次性转换
+        self.vectors = as_embedding_array(self.vectors, self.dtype)
+        self.model_used = _intern(self.model_used)
 
-@dataclass
+    def to_list(self) -> List[List[float]]:
+        """转换为嵌套列表（用于JSON序列化）"""
+        return self.vectors.tolist()
+
+    def quantize(self, dtype: str) -> 'EmbeddingResult':
+        """返回量化后的嵌入结果（仅支持由 float32 结果量化）
+
+        Args:
+            dtype: 目标类型 ('float16' 或 'int8')
+
+        Returns:
+            新的嵌入结果
+        """
+        vectors, scale = quantize_embeddings(self.vectors, dtype)
+        return EmbeddingResult(
+            vectors=vectors,
+            model_used=self.model_used,
+            tokens_used=self.tokens_used,
+            metadata=self.metadata,
+            dtype=dtype,
+            scale=scale
+        )
+
+
+@add_slots
+@dataclass(frozen=True)
 class DocumentChunk:
     """文档块"""
     content: str
@@ -66,8 +156,12 @@ class DocumentChunk:
     chunk_id: Optional[str] = None
     source: Optional[str] = None
 
+    def __post_init__(self):
+        object.__setattr__(self, 'source', _intern(self.source))
 
-@dataclass
+
+@add_slots
+@dataclass(frozen=True)
 class SearchResult:
     """搜索结果"""
     document: DocumentChunk
@@ -75,7 +169,70 @@ class SearchResult:
     rank: int
 
 
-class ILLMService(ABC):
+# 消息角色编码（MessageBatch 中按 uint8 存储）
+ROLE_CODES: Dict[str, int] = {'user': 0, 'assistant': 1, 'system': 2}
+UNKNOWN_ROLE_CODE = 255
+
+
+@add_slots
+@dataclass
+class MessageBatch:
+    """列式存储的消息批次
+
+    内容、角色等字段各自连续存放，供嵌入和token统计按列批量处理，
+    避免逐条访问 ChatMessage 对象的属性。
+    """
+    contents: List[str]
+    roles: np.ndarray  # uint8 角色编码，见 ROLE_CODES
+    tokens: Optional[np.ndarray] = None  # 每条消息的token数（可选）
+
+    @classmethod
+    def from_messages(cls, messages: List[ChatMessage]) -> 'MessageBatch':
+        """由聊天消息列表构建"""
+        contents = [message.content for message in messages]
+        roles = np.fromiter(
+            (ROLE_CODES.get(message.role, UNKNOWN_ROLE_CODE) for message in messages),
+            dtype=np.uint8,
+            count=len(messages)
+        )
+        return cls(contents=contents, roles=roles)
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def total_chars(self) -> int:
+        """所有消息内容的字符总数"""
+        return sum(map(len, self.contents))
+
+    def role_mask(self, role: str) -> np.ndarray:
+        """指定角色消息的布尔掩码"""
+        return self.roles == ROLE_CODES.get(role, UNKNOWN_ROLE_CODE)
+
+
+def texts_of(texts: Union[List[str], MessageBatch]) -> List[str]:
+    """获取待嵌入的文本列表（MessageBatch 取其内容列）"""
+    if isinstance(texts, MessageBatch):
+        return texts.contents
+    return texts
+
+
+class IConnectedService(ABC):
+    """需要长连接资源的外部服务基础接口"""
+
+    async def startup(self) -> None:
+        """创建连接池等长生命周期资源（默认无操作）
+
+        实现类应在此创建并复用共享的 HTTP 会话，避免每次调用重新建立 TCP/TLS 连接，例如
+        aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=100, limit_per_host=32, ttl_dns_cache=300))。
+        """
+        pass
+
+    async def shutdown(self) -> None:
+        """释放 startup 中创建的资源（默认无操作）"""
+        pass
+
+
+class ILLMService(IConnectedService):
     """大语言模型服务抽象接口"""
 
     @abstractmethod
@@ -83,15 +240,14 @@ class ILLMService(ABC):
         """获取可用模型列表"""
         pass
 
-    @abstractmethod
     def chat(self,
              messages: List[ChatMessage],
              model: Optional[str] = None,
              temperature: float = 0.7,
              max_tokens: Optional[int] = None,
              **kwargs) -> ChatResponse:
-        """聊天对话"""
-        pass
+        """聊天对话（默认通过后台事件循环执行 chat_async）"""
+        return run_sync(self.chat_async(messages, model, temperature, max_tokens, **kwargs))
 
     @abstractmethod
     async def chat_async(self,
@@ -103,15 +259,58 @@ class ILLMService(ABC):
         """异步聊天对话"""
         pass
 
+    async def chat_batch_async(self,
+                               conversations: List[List[ChatMessage]],
+                               model: Optional[str] = None,
+                               temperature: float = 0.7,
+                               max_tokens: Optional[int] = None,
+                               max_concurrency: int = 16,
+                               **kwargs) -> List[Union[ChatResponse, BaseException]]:
+        """批量异步聊天对话
+
+        以最多 max_concurrency 个并发请求调用 chat_async，结果与 conversations 一一对应；
+        单个对话失败时对应位置返回异常对象，不影响其他对话。
+
+        Args:
+            conversations: 多组对话消息
+            model: 模型名称
+            temperature: 温度
+            max_tokens: 最大生成token数
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            聊天响应（或异常）列表
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _chat(messages: List[ChatMessage]) -> ChatResponse:
+            async with semaphore:
+                return await self.chat_async(messages, model, temperature, max_tokens, **kwargs)
+
+        return await asyncio.gather(*[_chat(messages) for messages in conversations], return_exceptions=True)
+
     @abstractmethod
+    def stream_chat_async(self,
+                          messages: List[ChatMessage],
+                          model: Optional[str] = None,
+                          temperature: float = 0.7,
+                          max_tokens: Optional[int] = None,
+                          **kwargs) -> AsyncIterator[ChatResponse]:
+        """异步流式聊天对话
+
+        实现为异步生成器（async def ... yield），每生成一段内容产出一个 ChatResponse，
+        服务端可在事件循环中直接转发，无需占用线程。
+        """
+        pass
+
     def stream_chat(self,
                    messages: List[ChatMessage],
                    model: Optional[str] = None,
                    temperature: float = 0.7,
                    max_tokens: Optional[int] = None,
-                   **kwargs):
-        """流式聊天对话"""
-        pass
+                   **kwargs) -> Iterator[ChatResponse]:
+        """流式聊天对话（默认通过后台事件循环逐段消费 stream_chat_async）"""
+        return iterate_sync(self.stream_chat_async(messages, model, temperature, max_tokens, **kwargs))
 
     @abstractmethod
     def get_model_status(self, model: str) -> ModelStatus:
@@ -119,42 +318,221 @@ class ILLMService(ABC):
         pass
 
     @abstractmethod
-    def validate_connection(self) -> bool:
-        """验证连接"""
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        """验证连接（不阻塞事件循环）
+
+        实现类应带熔断保护（可使用 CircuitBreakerMixin），后端故障期间
+        返回缓存的失败状态，每个冷却周期只放行一次探测。
+
+        Args:
+            timeout_s: 探测超时时间（秒）
+        """
         pass
 
 
-class IEmbeddingService(ABC):
+class _EmbeddingCoalescer:
+    """查询嵌入合并器
+
+    在短时间窗口内到达的多个 embed_query_async 请求合并为一次 embed_texts_async 批量调用，
+    分摊每次请求的网络与协议开销。需在事件循环中启动，只服务于该循环。
+    """
+
+    def __init__(self, service: 'IEmbeddingService', max_batch: int = 64, window_ms: float = 2.0):
+        """初始化合并器
+
+        Args:
+            service: 嵌入服务
+            max_batch: 单次合并的最大查询数
+            window_ms: 收到首个查询后等待更多查询的时间（毫秒）
+        """
+        self._service = service
+        self._max_batch = max_batch
+        self._window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushing: set = set()  # 持有进行中的批量任务引用，防止被回收
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """在当前事件循环中启动合并任务"""
+        self.loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = self.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止合并任务，未处理的查询以异常结束"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(EmbeddingServiceException("查询嵌入合并器已停止"))
+
+    async def embed(self, query: str, model: Optional[str]) -> np.ndarray:
+        """提交查询并等待合并后的嵌入结果"""
+        future = self.loop.create_future()
+        self._queue.put_nowait((query, model, future))
+        return await future
+
+    async def _run(self) -> None:
+        """合并循环：取到首个查询后等待一个窗口，再取走队列中已有的查询"""
+        queue = self._queue
+        while True:
+            items = [await queue.get()]
+            if self._window > 0:
+                await asyncio.sleep(self._window)
+            while len(items) < self._max_batch and not queue.empty():
+                items.append(queue.get_nowait())
+
+            # 不同模型分别批量请求，嵌入调用在独立任务中执行，合并循环继续收集
+            by_model: Dict[Optional[str], list] = {}
+            for item in items:
+                by_model.setdefault(item[1], []).append(item)
+            for model, batch in by_model.items():
+                task = self.loop.create_task(self._flush(model, batch))
+                self._flushing.add(task)
+                task.add_done_callback(self._flushing.discard)
+
+    async def _flush(self, model: Optional[str], batch: list) -> None:
+        """执行一次批量嵌入并分发结果"""
+        try:
+            result = await self._service.embed_texts_async([query for query, _, _ in batch], model=model)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), vector in zip(batch, result.vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+class IEmbeddingService(IConnectedService):
     """嵌入服务抽象接口"""
 
+    async def startup(self) -> None:
+        """启动查询嵌入合并（实现类重写时应调用 super().startup()）"""
+        self.start_query_coalescing()
+
+    async def shutdown(self) -> None:
+        """停止查询嵌入合并（实现类重写时应调用 super().shutdown()）"""
+        await self.stop_query_coalescing()
+
+    def start_query_coalescing(self, max_batch: int = 64, window_ms: float = 2.0) -> None:
+        """在当前事件循环中启动查询嵌入合并
+
+        Args:
+            max_batch: 单次合并的最大查询数
+            window_ms: 合并窗口（毫秒）
+        """
+        coalescer = _EmbeddingCoalescer(self, max_batch, window_ms)
+        coalescer.start()
+        self._query_coalescer = coalescer
+
+    async def stop_query_coalescing(self) -> None:
+        """停止查询嵌入合并"""
+        coalescer = getattr(self, '_query_coalescer', None)
+        if coalescer is not None:
+            self._query_coalescer = None
+            await coalescer.stop()
+
     @abstractmethod
     def get_available_models(self) -> List[ModelInfo]:
         """获取可用嵌入模型列表"""
         pass
 
-    @abstractmethod
     def embed_texts(self,
-                   texts: List[str],
+                   texts: Union[List[str], MessageBatch],
                    model: Optional[str] = None,
                    **kwargs) -> EmbeddingResult:
-        """文本嵌入"""
-        pass
+        """文本嵌入（默认通过后台事件循环执行 embed_texts_async）"""
+        return run_sync(self.embed_texts_async(texts, model, **kwargs))
 
     @abstractmethod
     async def embed_texts_async(self,
-                               texts: List[str],
+                               texts: Union[List[str], MessageBatch],
                                model: Optional[str] = None,
                                **kwargs) -> EmbeddingResult:
-        """异步文本嵌入"""
+        """异步文本嵌入（实现类通过 texts_of(texts) 取得文本列表）"""
         pass
 
-    @abstractmethod
+    async def embed_texts_batched_async(self,
+                                        texts: Union[List[str], MessageBatch],
+                                        model: Optional[str] = None,
+                                        batch_size: int = 64,
+                                        max_concurrency: Optional[int] = None,
+                                        **kwargs) -> EmbeddingResult:
+        """分批并发文本嵌入
+
+        按 batch_size 切分文本，以最多 max_concurrency 个并发请求调用 embed_texts_async，
+        结果按原顺序拼接。实现类可按服务端批量上限重写。
+
+        Args:
+            texts: 文本列表或消息批次
+            model: 模型名称
+            batch_size: 每批文本数
+            max_concurrency: 最大并发请求数，默认取 DEFAULT_EMBEDDING_CONCURRENCY
+
+        Returns:
+            合并后的嵌入结果
+        """
+        texts = texts_of(texts)
+        semaphore = asyncio.Semaphore(max_concurrency or DEFAULT_EMBEDDING_CONCURRENCY)
+
+        async def _embed_batch(batch: List[str]) -> EmbeddingResult:
+            async with semaphore:
+                return await self.embed_texts_async(batch, model=model, **kwargs)
+
+        results = await asyncio.gather(*[
+            _embed_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)
+        ])
+
+        tokens_used: Optional[int] = None
+        for result in results:
+            if result.tokens_used is not None:
+                tokens_used = (tokens_used or 0) + result.tokens_used
+
+        if not results:
+            vectors = np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+        elif len(results) == 1:
+            vectors = results[0].vectors
+        else:
+            vectors = np.concatenate([result.vectors for result in results])
+
+        return EmbeddingResult(
+            vectors=vectors,
+            model_used=results[0].model_used if results else (model or ""),
+            tokens_used=tokens_used
+        )
+
     def embed_query(self,
                    query: str,
                    model: Optional[str] = None,
-                   **kwargs) -> List[float]:
-        """查询嵌入"""
-        pass
+                   **kwargs) -> np.ndarray:
+        """查询嵌入（返回形状为 (d,) 的 float32 数组）"""
+        return self.embed_texts([query], model, **kwargs).vectors[0]
+
+    async def embed_query_async(self,
+                                query: str,
+                                model: Optional[str] = None,
+                                **kwargs) -> np.ndarray:
+        """异步查询嵌入
+
+        已启动查询合并且在同一事件循环中调用时，与其他并发查询合并为一次批量请求。
+        """
+        coalescer = getattr(self, '_query_coalescer', None)
+        if coalescer is not None and not kwargs and coalescer.loop is asyncio.get_running_loop():
+            return await coalescer.embed(query, model)
+
+        result = await self.embed_texts_async([query], model, **kwargs)
+        return result.vectors[0]
 
     @abstractmethod
     def get_embedding_dimension(self, model: Optional[str] = None) -> int:
@@ -162,20 +540,37 @@ class IEmbeddingService(ABC):
         pass
 
     @abstractmethod
-    def validate_connection(self) -> bool:
-        """验证连接"""
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        """验证连接（不阻塞事件循环）
+
+        实现类应带熔断保护（可使用 CircuitBreakerMixin），后端故障期间
+        返回缓存的失败状态，每个冷却周期只放行一次探测。
+
+        Args:
+            timeout_s: 探测超时时间（秒）
+        """
         pass
 
 
-class IVectorStoreService(ABC):
+class IVectorStoreService(IConnectedService):
     """向量存储服务抽象接口"""
 
     @abstractmethod
     def create_collection(self,
                          name: str,
                          dimension: int,
-                         metadata: Optional[Dict[str, Any]] = None) -> bool:
-        """创建集合"""
+                         metadata: Optional[Dict[str, Any]] = None,
+                         quantization: Optional[Dict[str, Any]] = None) -> bool:
+        """创建集合
+
+        Args:
+            name: 集合名称
+            dimension: 向量维度
+            metadata: 集合元数据
+            quantization: 向量量化配置，如 {'type': 'float16'}、{'type': 'int8'}
+                或 {'type': 'pq', 'm': 96}；为 None 时按 float32 存储。
+                FAISS 实现可分别对应 IndexHNSWFlat、IndexHNSWSQ 和 IndexIVFPQ。
+        """
         pass
 
     @abstractmethod
@@ -192,21 +587,114 @@ class IVectorStoreService(ABC):
     def add_documents(self,
                      collection_name: str,
                      documents: List[DocumentChunk],
-                     embeddings: List[List[float]],
+                     embeddings: np.ndarray,
                      **kwargs) -> bool:
-        """添加文档"""
+        """添加文档（embeddings 为形状 (N, d) 的 float32 数组）"""
         pass
 
+    async def add_documents_stream(self,
+                                   collection_name: str,
+                                   batches: AsyncIterable[Tuple[List[DocumentChunk], np.ndarray]],
+                                   max_inflight: int = 4,
+                                   **kwargs) -> int:
+        """流式批量添加文档
+
+        逐批消费 (文档块, 嵌入矩阵)，同时最多 max_inflight 批在写入；写入槽位占满时
+        暂停拉取下一批，内存占用与总文档数无关。嵌入与写入可流水线执行，例如
+        batches 由 embed_texts_async 逐批生成。
+
+        默认实现在线程中调用 add_documents；支持异步批量写入的后端可重写。
+
+        Args:
+            collection_name: 集合名称
+            batches: 异步产出 (文档块列表, 形状为 (n, d) 的嵌入矩阵) 的可迭代对象
+            max_inflight: 同时写入的最大批数
+
+        Returns:
+            成功写入的文档数
+        """
+        semaphore = asyncio.Semaphore(max_inflight)
+
+        async def upload(documents: List[DocumentChunk], embeddings: np.ndarray) -> int:
+            try:
+                added = await asyncio.to_thread(
+                    self.add_documents, collection_name, documents, embeddings, **kwargs
+                )
+                return len(documents) if added else 0
+            finally:
+                semaphore.release()
+
+        tasks = []
+        try:
+            async for documents, embeddings in batches:
+                # 先取得写入槽位再创建任务，避免上游批次在内存中堆积
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(upload(documents, embeddings)))
+            return sum(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
     @abstractmethod
     def search(self,
               collection_name: str,
-              query_embedding: List[float],
+              query_embedding: np.ndarray,
               top_k: int = 5,
               filter_conditions: Optional[Dict[str, Any]] = None,
               **kwargs) -> List[SearchResult]:
-        """相似性搜索"""
+        """相似性搜索（query_embedding 为形状 (d,) 的 float32 数组）
+
+        返回结果按得分降序排列并填好 rank（从0开始）；内存检索可直接使用
+        search_utils.search_embeddings，只选前 top_k 项而不对全部得分排序。
+        """
         pass
 
+    def batch_search(self,
+                     collection_name: str,
+                     query_embeddings: np.ndarray,
+                     top_k: int = 5,
+                     filter_conditions: Optional[Dict[str, Any]] = None,
+                     **kwargs) -> List[List[SearchResult]]:
+        """批量相似性搜索
+
+        默认实现用线程池并发调用 search；支持矩阵查询的后端（如 FAISS 的 index.search）
+        应重写为一次性检索全部查询。
+
+        Args:
+            collection_name: 集合名称
+            query_embeddings: 形状为 (Q, d) 的查询向量矩阵
+            top_k: 每个查询返回的结果数
+            filter_conditions: 过滤条件
+
+        Returns:
+            与 query_embeddings 一一对应的搜索结果列表
+        """
+        if len(query_embeddings) <= 1:
+            return [
+                self.search(collection_name, query_embedding, top_k, filter_conditions, **kwargs)
+                for query_embedding in query_embeddings
+            ]
+
+        with ThreadPoolExecutor(max_workers=min(_BATCH_SEARCH_WORKERS, len(query_embeddings))) as executor:
+            return list(executor.map(
+                lambda query_embedding: self.search(
+                    collection_name, query_embedding, top_k, filter_conditions, **kwargs
+                ),
+                query_embeddings
+            ))
+
+    async def batch_search_async(self,
+                                 collection_name: str,
+                                 query_embeddings: np.ndarray,
+                                 top_k: int = 5,
+                                 filter_conditions: Optional[Dict[str, Any]] = None,
+                                 **kwargs) -> List[List[SearchResult]]:
+        """异步批量相似性搜索（在线程中执行 batch_search，不阻塞事件循环）"""
+        return await asyncio.to_thread(
+            self.batch_search, collection_name, query_embeddings, top_k, filter_conditions, **kwargs
+        )
+
     @abstractmethod
     def delete_documents(self,
                         collection_name: str,
@@ -220,8 +708,15 @@ class IVectorStoreService(ABC):
         pass
 
     @abstractmethod
-    def validate_connection(self) -> bool:
-        """验证连接"""
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        """验证连接（不阻塞事件循环）
+
+        实现类应带熔断保护（可使用 CircuitBreakerMixin），后端故障期间
+        返回缓存的失败状态，每个冷却周期只放行一次探测。
+
+        Args:
+            timeout_s: 探测超时时间（秒）
+        """
         pass
 
 
@@ -260,7 +755,11 @@ class IMemoryService(ABC):
     def save_conversation(self,
                          conversation_id: str,
                          messages: List[ChatMessage]) -> bool:
-        """保存对话"""
+        """保存对话
+
+        实现类应按 ChatMessage.digest() 跳过内容未变化的消息，只对新增或修改的消息重新嵌入
+        （可使用 ConversationHashCacheMixin）。
+        """
         pass
 
     @abstractmethod
@@ -299,6 +798,25 @@ class IRateLimiterService(ABC):
         """
         pass
 
+    def check_rate_limit_bulk(self,
+                              requests: List[Tuple[str, int, int]]) -> List[Tuple[bool, int]]:
+        """批量检查限流状态
+
+        默认实现逐个调用 check_rate_limit；实现类应重写为一次完成全部检查，
+        如进程内实现只加一次锁，Redis 实现在一个 pipeline 中执行全部 key 的限流命令
+        （N 个 key 只需一次往返）。
+
+        Args:
+            requests: (key, limit, window_seconds) 列表
+
+        Returns:
+            与 requests 一一对应的 (是否允许请求, 剩余配额)
+        """
+        return [
+            self.check_rate_limit(key, limit, window_seconds)
+            for key, limit, window_seconds in requests
+        ]
+
     @abstractmethod
     def reset_rate_limit(self, key: str) -> bool:
         """重置限流"""
@@ -323,6 +841,25 @@ class IHealthCheckService(ABC):
         """检查所有服务健康状态"""
         pass
 
+    async def validate_connections_async(self,
+                                         services: Dict[str, Any],
+                                         timeout_s: float = 2.0) -> Dict[str, bool]:
+        """并发验证多个外部服务的连接
+
+        Args:
+            services: 服务名称 -> 提供 async validate_connection 的服务实例
+            timeout_s: 单个服务的探测超时时间（秒）
+
+        Returns:
+            服务名称 -> 连接是否可用
+        """
+        names = list(services)
+        results = await asyncio.gather(
+            *(services[name].validate_connection(timeout_s) for name in names),
+            return_exceptions=True
+        )
+        return {name: result is True for name, result in zip(names, results)}
+
     @abstractmethod
     def register_health_check(self,
                              service_name: str,
@@ -0,0 +1,215 @@
+"""
+外部服务实现辅助混入类
+为接口实现类提供可复用的通用机制
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple
+
+from .interfaces import ChatMessage
+
+
+class IndexHandleCacheMixin:
+    """向量索引句柄缓存混入类
+
+    按 (集合名称, 索引版本) 缓存已反序列化的索引句柄（如 FAISS/HNSW 索引），
+    search 通过 _get_index_handle 获取句柄，避免每次查询重新加载索引；
+    add_documents/delete_documents 修改集合后调用 _invalidate_index_handle。
+
+    用法:
+        class FaissVectorStore(IndexHandleCacheMixin, IVectorStoreService):
+            def __init__(self):
+                super().__init__(max_index_handles=16)
+
+            def _open_index(self, collection_name):
+                return faiss.read_index(self._index_path(collection_name))
+    """
+
+    def __init__(self, *args, max_index_handles: int = 32, **kwargs):
+        """初始化索引句柄缓存
+
+        Args:
+            max_index_handles: 最多缓存的索引句柄数，超出时淘汰最久未使用的句柄
+        """
+        super().__init__(*args, **kwargs)
+        self._max_index_handles = max_index_handles
+        self._index_handles: 'OrderedDict[Tuple[str, Hashable], Any]' = OrderedDict()
+        self._index_handles_lock = threading.Lock()
+
+    def _open_index(self, collection_name: str) -> Any:
+        """打开（反序列化）集合的索引，由实现类提供"""
+        raise NotImplementedError
+
+    def _index_version(self, collection_name: str) -> Hashable:
+        """集合索引的版本标识（如文件修改时间），版本变化时重新打开索引；默认不区分版本"""
+        return None
+
+    def _get_index_handle(self, collection_name: str) -> Any:
+        """获取集合的索引句柄，未缓存时打开并缓存"""
+        key = (collection_name, self._index_version(collection_name))
+
+        with self._index_handles_lock:
+            handle = self._index_handles.get(key)
+            if handle is not None:
+                self._index_handles.move_to_end(key)
+                return handle
+
+        # 索引在锁外打开，加载大索引时不阻塞其他集合的查询
+        handle = self._open_index(collection_name)
+
+        with self._index_handles_lock:
+            # 同一集合只保留当前版本的句柄
+            for stale_key in [k for k in self._index_handles if k[0] == collection_name and k != key]:
+                del self._index_handles[stale_key]
+            handle = self._index_handles.setdefault(key, handle)
+            self._index_handles.move_to_end(key)
+            while len(self._index_handles) > self._max_index_handles:
+                self._index_handles.popitem(last=False)
+        return handle
+
+    def _invalidate_index_handle(self, collection_name: str) -> None:
+        """移除集合的缓存句柄（集合内容变化或删除后调用）"""
+        with self._index_handles_lock:
+            for key in [k for k in self._index_handles if k[0] == collection_name]:
+                del self._index_handles[key]
+
+
+class ConversationHashCacheMixin:
+    """对话内容哈希缓存混入类
+
+    IMemoryService 实现在 save_conversation 中调用 _changed_message_indices，
+    只对新增或内容变化的消息重新嵌入/索引；追加消息的常见场景下每次只处理新消息。
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化对话哈希缓存"""
+        super().__init__(*args, **kwargs)
+        self._conversation_hashes: Dict[str, List[int]] = {}
+        self._conversation_hashes_lock = threading.Lock()
+
+    def _changed_message_indices(self, conversation_id: str, messages: List[ChatMessage]) -> List[int]:
+        """比较并记录对话的消息哈希
+
+        Args:
+            conversation_id: 对话ID
+            messages: 当前完整的消息列表
+
+        Returns:
+            需要重新处理的消息下标
+        """
+        hashes = [message.digest() for message in messages]
+
+        with self._conversation_hashes_lock:
+            previous = self._conversation_hashes.get(conversation_id, ())
+            self._conversation_hashes[conversation_id] = hashes
+
+        changed = [
+            index for index, content_hash in enumerate(hashes)
+            if index >= len(previous) or previous[index] != content_hash
+        ]
+
+        if hashes:
+            # 延迟导入，避免 monitoring 与 external 之间的循环导入
+            from ..monitoring.metrics_service import get_metrics_service
+            get_metrics_service().record_metric(
+                'memory.cache_hit_rate', 1 - len(changed) / len(hashes)
+            )
+        return changed
+
+    def _forget_conversation_hashes(self, conversation_id: str) -> None:
+        """删除对话后清除其哈希记录"""
+        with self._conversation_hashes_lock:
+            self._conversation_hashes.pop(conversation_id, None)
+
+
+class CircuitBreakerMixin:
+    """连接验证熔断混入类
+
+    为外部服务提供 validate_connection 的熔断实现，实现类只需提供 _probe_connection：
+    - closed: 每次调用都探测，连续失败达到阈值后进入 open
+    - open: 冷却期内直接返回 False，不访问后端
+    - half_open: 冷却期结束后只放行一次探测，成功则恢复 closed，失败则重新进入 open
+
+    后端故障期间，无论多少调用方在轮询，对后端的探测频率都不超过每个冷却周期一次。
+
+    用法:
+        class GeminiLLMService(CircuitBreakerMixin, ILLMService):
+            async def _probe_connection(self) -> bool:
+                ...
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, *args,
+                 breaker_failure_threshold: int = 3,
+                 breaker_cooldown_s: float = 1.0,
+                 **kwargs):
+        """初始化熔断状态
+
+        Args:
+            breaker_failure_threshold: 连续失败多少次后熔断
+            breaker_cooldown_s: 熔断后到下一次探测的冷却时间（秒）
+        """
+        super().__init__(*args, **kwargs)
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_cooldown_s = breaker_cooldown_s
+        self._breaker_state = self.CLOSED
+        self._breaker_failure_count = 0
+        self._breaker_last_failure_ts = 0.0
+        self._breaker_lock = threading.Lock()
+
+    async def _probe_connection(self) -> bool:
+        """实际探测后端连接，由实现类提供"""
+        raise NotImplementedError
+
+    @property
+    def circuit_state(self) -> str:
+        """当前熔断状态"""
+        return self._breaker_state
+
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        """验证连接（带熔断）
+
+        Args:
+            timeout_s: 探测超时时间（秒）
+
+        Returns:
+            连接是否可用
+        """
+        with self._breaker_lock:
+            if self._breaker_state != self.CLOSED:
+                cooling = time.monotonic() - self._breaker_last_failure_ts < self._breaker_cooldown_s
+                if self._breaker_state == self.HALF_OPEN or cooling:
+                    # 探测进行中或仍在冷却期，直接返回缓存的失败状态
+                    return False
+                self._breaker_state = self.HALF_OPEN
+
+        try:
+            ok = bool(await asyncio.wait_for(self._probe_connection(), timeout_s))
+        except asyncio.CancelledError:
+            self._record_probe_result(False)
+            raise
+        except Exception:
+            ok = False
+
+        self._record_probe_result(ok)
+        return ok
+
+    def _record_probe_result(self, ok: bool) -> None:
+        """根据探测结果更新熔断状态"""
+        with self._breaker_lock:
+            if ok:
+                self._breaker_state = self.CLOSED
+                self._breaker_failure_count = 0
+                return
+
+            self._breaker_failure_count += 1
+            self._breaker_last_failure_ts = time.monotonic()
+            if (self._breaker_state == self.HALF_OPEN
+                    or self._breaker_failure_count >= self._breaker_failure_threshold):
+                self._breaker_state = self.OPEN
@@ -0,0 +1,132 @@
+"""
+进程内限流服务
+基于滑动窗口日志的限流实现，适用于单进程部署
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, DefaultDict, Dict, List, Tuple
+
+from .interfaces import IRateLimiterService
+
+# 清理过期 key 的间隔（秒）：不再被检查的 key 也会被定期移除，内存随活跃 key 数有界
+_SWEEP_INTERVAL = 60.0
+
+
+class InMemoryRateLimiter(IRateLimiterService):
+    """进程内滑动窗口限流器
+
+    每个 key 保存窗口内请求时间戳的 deque，检查时只从队头淘汰过期时间戳，
+    单次检查均摊 O(1)。批量检查在一次加锁内完成全部 key，
+    同一请求路径检查多个 key（多租户/多模型路由）时不会反复争用锁。
+    窗口内已无请求的 key 会被移除，检查时顺带定期清理全部过期 key。
+    """
+
+    def __init__(self):
+        """初始化限流器"""
+        self._requests: DefaultDict[str, Deque[float]] = defaultdict(deque)
+        self._limits: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + _SWEEP_INTERVAL
+
+    def _evict(self, key: str, now: float) -> Deque[float]:
+        """淘汰 key 的过期时间戳，窗口内已无请求时移除该 key（调用方需持有锁）"""
+        timestamps = self._requests.get(key)
+        if timestamps is None:
+            return deque()
+
+        cutoff = now - self._limits[key][1]
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        if not timestamps:
+            del self._requests[key]
+            del self._limits[key]
+        return timestamps
+
+    def _sweep(self, now: float) -> None:
+        """移除最新请求也已过期的 key（调用方需持有锁）"""
+        self._next_sweep = now + _SWEEP_INTERVAL
+        expired = [
+            key for key, timestamps in self._requests.items()
+            if not timestamps or timestamps[-1] <= now - self._limits[key][1]
+        ]
+        for key in expired:
+            del self._requests[key]
+            del self._limits[key]
+
+    def _check(self, key: str, limit: int, window_seconds: int, now: float) -> Tuple[bool, int]:
+        """检查并记录一次请求（调用方需持有锁）"""
+        timestamps = self._requests.get(key)
+        if timestamps is not None:
+            cutoff = now - window_seconds
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+
+        if not timestamps:
+            # 窗口内无请求：拒绝时不为该 key 保留状态，允许时再重新创建
+            if limit <= 0:
+                self._requests.pop(key, None)
+                self._limits.pop(key, None)
+                return False, 0
+            timestamps = self._requests[key]
+        elif len(timestamps) >= limit:
+            self._limits[key] = (limit, window_seconds)
+            return False, 0
+
+        self._limits[key] = (limit, window_seconds)
+        timestamps.append(now)
+        return True, limit - len(timestamps)
+
+    def check_rate_limit(self,
+                         key: str,
+                         limit: int,
+                         window_seconds: int) -> Tuple[bool, int]:
+        """检查限流状态
+
+        Returns:
+            Tuple[bool, int]: (是否允许请求, 剩余配额)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            return self._check(key, limit, window_seconds, now)
+
+    def check_rate_limit_bulk(self,
+                              requests: List[Tuple[str, int, int]]) -> List[Tuple[bool, int]]:
+        """批量检查限流状态（一次加锁完成全部检查）"""
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            return [
+                self._check(key, limit, window_seconds, now)
+                for key, limit, window_seconds in requests
+            ]
+
+    def reset_rate_limit(self, key: str) -> bool:
+        """重置限流"""
+        with self._lock:
+            self._limits.pop(key, None)
+            return self._requests.pop(key, None) is not None
+
+    def get_rate_limit_info(self, key: str) -> Dict[str, Any]:
+        """获取限流信息"""
+        now = time.monotonic()
+        with self._lock:
+            limit, window_seconds = self._limits.get(key, (0, 0))
+            # 淘汰过期时间戳后队头即窗口内最早的请求
+            timestamps = self._evict(key, now)
+            used = len(timestamps)
+            reset_in = (timestamps[0] + window_seconds - now) if used else 0.0
+
+        return {
+            'key': key,
+            'limit': limit,
+            'window_seconds': window_seconds,
+            'used': used,
+            'remaining': max(limit - used, 0),
+            'reset_in_seconds': max(reset_in, 0.0)
+        }
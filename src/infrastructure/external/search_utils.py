@@ -0,0 +1,61 @@
+"""
+向量检索工具
+只需要前 k 个结果时使用 argpartition 线性选择，避免对全部得分排序
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .embedding_utils import as_embedding_array
+from .interfaces import DocumentChunk, SearchResult
+
+
+def topk(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """选出得分最高的 k 项（按得分降序）
+
+    先用 argpartition 以 O(N) 选出前 k 项，再只对这 k 项排序。
+
+    Args:
+        scores: 一维得分数组
+        k: 返回数量
+
+    Returns:
+        (索引数组, 得分数组)
+    """
+    count = scores.shape[0]
+    if k <= 0 or count == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, scores[empty]
+
+    if k < count:
+        indices = np.argpartition(-scores, k - 1)[:k]
+    else:
+        indices = np.arange(count)
+    indices = indices[np.argsort(-scores[indices], kind='stable')]
+    return indices, scores[indices]
+
+
+def search_embeddings(embeddings: np.ndarray,
+                      query_embedding: np.ndarray,
+                      documents: Sequence[DocumentChunk],
+                      top_k: int = 5) -> List[SearchResult]:
+    """在内存中的嵌入矩阵上做内积检索（向量已归一化时即余弦相似度）
+
+    供 IVectorStoreService 的简单实现直接使用，结果已按得分排序并填好 rank。
+
+    Args:
+        embeddings: 形状为 (N, d) 的文档嵌入矩阵
+        query_embedding: 形状为 (d,) 的查询向量
+        documents: 与嵌入一一对应的文档块
+        top_k: 返回数量
+
+    Returns:
+        搜索结果列表
+    """
+    scores = as_embedding_array(embeddings) @ as_embedding_array(query_embedding)
+    indices, top_scores = topk(scores, top_k)
+    return [
+        SearchResult(document=documents[index], score=float(score), rank=rank)
+        for rank, (index, score) in enumerate(zip(indices.tolist(), top_scores.tolist()))
+    ]
@@ -0,0 +1,437 @@
+"""
+语义缓存
+基于随机投影LSH按查询向量的语义相似度缓存检索结果和聊天响应，
+相似查询直接命中缓存，省去远程检索和LLM调用
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_utils import EMBEDDING_DTYPE, as_embedding_array
+from .interfaces import (
+    ChatMessage,
+    ChatResponse,
+    DocumentChunk,
+    IEmbeddingService,
+    ILLMService,
+    IVectorStoreService,
+    ModelInfo,
+    ModelStatus,
+    SearchResult
+)
+
+
+class ISemanticCache(ABC):
+    """语义缓存抽象接口"""
+
+    @abstractmethod
+    def get_search(self,
+                   collection_name: str,
+                   query_embedding: np.ndarray,
+                   top_k: int,
+                   threshold: Optional[float] = None) -> Optional[List[SearchResult]]:
+        """查找语义相近查询的检索结果，未命中返回None"""
+        pass
+
+    @abstractmethod
+    def put_search(self,
+                   collection_name: str,
+                   query_embedding: np.ndarray,
+                   top_k: int,
+                   results: List[SearchResult],
+                   generation: Optional[int] = None) -> None:
+        """缓存检索结果（generation 与集合当前版本不一致时不写入）"""
+        pass
+
+    @abstractmethod
+    def get_search_generation(self, collection_name: str) -> int:
+        """获取集合检索缓存的版本号，每次清除检索缓存时递增"""
+        pass
+
+    @abstractmethod
+    def invalidate_search(self, collection_name: str) -> None:
+        """集合内容变化时清除其检索缓存"""
+        pass
+
+    @abstractmethod
+    def get_chat(self,
+                 query_embedding: np.ndarray,
+                 model: Optional[str] = None,
+                 threshold: Optional[float] = None,
+                 params: Tuple[Hashable, ...] = ()) -> Optional[ChatResponse]:
+        """查找语义相近对话的响应（params 为影响生成结果的参数），未命中返回None"""
+        pass
+
+    @abstractmethod
+    def put_chat(self,
+                 query_embedding: np.ndarray,
+                 response: ChatResponse,
+                 model: Optional[str] = None,
+                 params: Tuple[Hashable, ...] = ()) -> None:
+        """缓存聊天响应"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空缓存"""
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        pass
+
+
+class LSHSemanticCache(ISemanticCache):
+    """随机投影LSH语义缓存
+
+    查询向量归一化后与随机超平面矩阵相乘，符号位打包为桶键；
+    命中同一桶的候选再做一次余弦相似度校验，超过阈值才视为命中。
+    """
+
+    def __init__(self,
+                 nbits: int = 16,
+                 threshold: float = 0.95,
+                 max_buckets: int = 4096,
+                 bucket_size: int = 8,
+                 seed: int = 0):
+        """初始化语义缓存
+
+        Args:
+            nbits: 超平面数量（桶键位数），位数越多桶越细、命中越少
+            threshold: 默认余弦相似度阈值
+            max_buckets: 最大桶数量，超出时淘汰最久未使用的桶
+            bucket_size: 每个桶保留的最大条目数
+            seed: 随机超平面的种子
+        """
+        self._nbits = nbits
+        self._threshold = threshold
+        self._max_buckets = max_buckets
+        self._bucket_size = bucket_size
+        self._rng = np.random.default_rng(seed)
+
+        # 按向量维度延迟生成投影矩阵
+        self._projections: Dict[int, np.ndarray] = {}
+        # (命名空间, 桶键) -> [(归一化向量, 缓存值)]
+        self._buckets: 'OrderedDict[Tuple[Hashable, int], List[Tuple[np.ndarray, Any]]]' = OrderedDict()
+        # 集合 -> 检索缓存版本号：检索开始前记录，写入结果时版本已变化说明期间集合被修改
+        self._search_generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+
+    def get_search(self,
+                   collection_name: str,
+                   query_embedding: np.ndarray,
+                   top_k: int,
+                   threshold: Optional[float] = None) -> Optional[List[SearchResult]]:
+        """查找语义相近查询的检索结果"""
+        return self._get(('search', collection_name, top_k), query_embedding, threshold)
+
+    def put_search(self,
+                   collection_name: str,
+                   query_embedding: np.ndarray,
+                   top_k: int,
+                   results: List[SearchResult],
+                   generation: Optional[int] = None) -> None:
+        """缓存检索结果（检索期间集合被修改过时不写入）"""
+        self._put(('search', collection_name, top_k), query_embedding, list(results),
+                  generation_key=collection_name, generation=generation)
+
+    def get_search_generation(self, collection_name: str) -> int:
+        """获取集合检索缓存的版本号"""
+        with self._lock:
+            return self._search_generations.get(collection_name, 0)
+
+    def invalidate_search(self, collection_name: str) -> None:
+        """清除集合的检索缓存"""
+        with self._lock:
+            self._search_generations[collection_name] = self._search_generations.get(collection_name, 0) + 1
+            stale = [
+                key for key in self._buckets
+                if key[0][0] == 'search' and key[0][1] == collection_name
+            ]
+            for key in stale:
+                del self._buckets[key]
+
+    def get_chat(self,
+                 query_embedding: np.ndarray,
+                 model: Optional[str] = None,
+                 threshold: Optional[float] = None,
+                 params: Tuple[Hashable, ...] = ()) -> Optional[ChatResponse]:
+        """查找语义相近对话的响应"""
+        return self._get(('chat', model, params), query_embedding, threshold)
+
+    def put_chat(self,
+                 query_embedding: np.ndarray,
+                 response: ChatResponse,
+                 model: Optional[str] = None,
+                 params: Tuple[Hashable, ...] = ()) -> None:
+        """缓存聊天响应"""
+        self._put(('chat', model, params), query_embedding, response)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._buckets.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'buckets': len(self._buckets),
+                'entries': sum(len(bucket) for bucket in self._buckets.values()),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0
+            }
+
+    def _get(self, namespace: Hashable, query_embedding: np.ndarray, threshold: Optional[float]) -> Any:
+        """按命名空间查找缓存"""
+        vector = self._normalize(query_embedding)
+        key = (namespace, self._bucket_key(vector))
+        threshold = self._threshold if threshold is None else threshold
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket:
+                self._buckets.move_to_end(key)
+                # 桶内条目很少，逐个校验余弦相似度
+                for cached_vector, value in bucket:
+                    if float(cached_vector @ vector) >= threshold:
+                        self._hits += 1
+                        return value
+            self._misses += 1
+            return None
+
+    def _put(self,
+             namespace: Hashable,
+             query_embedding: np.ndarray,
+             value: Any,
+             generation_key: Optional[str] = None,
+             generation: Optional[int] = None) -> None:
+        """按命名空间写入缓存，传入的版本号已过期时放弃写入"""
+        vector = self._normalize(query_embedding)
+        key = (namespace, self._bucket_key(vector))
+
+        with self._lock:
+            if generation is not None and self._search_generations.get(generation_key, 0) != generation:
+                return
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = []
+                if len(self._buckets) > self._max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            bucket.append((vector, value))
+            if len(bucket) > self._bucket_size:
+                del bucket[0]
+
+    def _bucket_key(self, vector: np.ndarray) -> int:
+        """计算向量的LSH桶键"""
+        bits = (vector @ self._projection(vector.shape[0])) > 0
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+    def _projection(self, dimension: int) -> np.ndarray:
+        """获取指定维度的随机超平面矩阵"""
+        projection = self._projections.get(dimension)
+        if projection is None:
+            with self._lock:
+                projection = self._projections.get(dimension)
+                if projection is None:
+                    projection = self._rng.standard_normal((dimension, self._nbits)).astype(EMBEDDING_DTYPE)
+                    self._projections[dimension] = projection
+        return projection
+
+    @staticmethod
+    def _normalize(query_embedding: np.ndarray) -> np.ndarray:
+        """归一化查询向量（余弦相似度即点积）"""
+        vector = as_embedding_array(query_embedding).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+
+class SemanticCachedVectorStore(IVectorStoreService):
+    """带语义缓存的向量存储装饰器
+
+    search 先查语义缓存，未命中再委托给实际存储；集合内容变化时清除其检索缓存。
+    """
+
+    def __init__(self, store: IVectorStoreService, cache: ISemanticCache):
+        """初始化
+
+        Args:
+            store: 实际的向量存储服务
+            cache: 语义缓存
+        """
+        self._store = store
+        self._cache = cache
+
+    async def startup(self) -> None:
+        await self._store.startup()
+
+    async def shutdown(self) -> None:
+        await self._store.shutdown()
+
+    def create_collection(self,
+                          name: str,
+                          dimension: int,
+                          metadata: Optional[Dict[str, Any]] = None,
+                          quantization: Optional[Dict[str, Any]] = None) -> bool:
+        return self._store.create_collection(name, dimension, metadata, quantization)
+
+    def delete_collection(self, name: str) -> bool:
+        # 写入完成后再清除缓存，避免写入期间的检索把旧结果重新放回缓存
+        try:
+            return self._store.delete_collection(name)
+        finally:
+            self._cache.invalidate_search(name)
+
+    def list_collections(self) -> List[str]:
+        return self._store.list_collections()
+
+    def add_documents(self,
+                      collection_name: str,
+                      documents: List[DocumentChunk],
+                      embeddings: np.ndarray,
+                      **kwargs) -> bool:
+        try:
+            return self._store.add_documents(collection_name, documents, embeddings, **kwargs)
+        finally:
+            self._cache.invalidate_search(collection_name)
+
+    def search(self,
+               collection_name: str,
+               query_embedding: np.ndarray,
+               top_k: int = 5,
+               filter_conditions: Optional[Dict[str, Any]] = None,
+               **kwargs) -> List[SearchResult]:
+        # 带过滤条件的查询不走缓存
+        if filter_conditions or kwargs:
+            return self._store.search(collection_name, query_embedding, top_k, filter_conditions, **kwargs)
+
+        results = self._cache.get_search(collection_name, query_embedding, top_k)
+        if results is None:
+            # 检索前记录版本号，检索期间集合被修改时不缓存旧结果
+            generation = self._cache.get_search_generation(collection_name)
+            results = self._store.search(collection_name, query_embedding, top_k)
+            self._cache.put_search(collection_name, query_embedding, top_k, results, generation)
+        # 缓存的列表由所有调用方共享，返回副本
+        return list(results)
+
+    def delete_documents(self, collection_name: str, document_ids: List[str]) -> bool:
+        try:
+            return self._store.delete_documents(collection_name, document_ids)
+        finally:
+            self._cache.invalidate_search(collection_name)
+
+    def get_collection_stats(self, collection_name: str) -> Dict[str, Any]:
+        return self._store.get_collection_stats(collection_name)
+
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        return await self._store.validate_connection(timeout_s)
+
+
+class SemanticCachedLLMService(ILLMService):
+    """带语义缓存的LLM服务装饰器
+
+    以整段对话内容的嵌入作为缓存键，语义相近的对话直接返回缓存的响应。
+    """
+
+    def __init__(self, llm: ILLMService, embedder: IEmbeddingService, cache: ISemanticCache):
+        """初始化
+
+        Args:
+            llm: 实际的LLM服务
+            embedder: 用于计算对话嵌入的嵌入服务
+            cache: 语义缓存
+        """
+        self._llm = llm
+        self._embedder = embedder
+        self._cache = cache
+
+    async def startup(self) -> None:
+        await self._llm.startup()
+
+    async def shutdown(self) -> None:
+        await self._llm.shutdown()
+
+    @staticmethod
+    def _conversation_text(messages: List[ChatMessage]) -> str:
+        """拼接对话内容作为缓存键文本"""
+        return "\n".join(f"{message.role}: {message.content}" for message in messages)
+
+    def get_available_models(self) -> List[ModelInfo]:
+        return self._llm.get_available_models()
+
+    def chat(self,
+             messages: List[ChatMessage],
+             model: Optional[str] = None,
+             temperature: float = 0.7,
+             max_tokens: Optional[int] = None,
+             **kwargs) -> ChatResponse:
+        # 带额外参数的请求不走缓存
+        if kwargs:
+            return self._llm.chat(messages, model, temperature, max_tokens, **kwargs)
+
+        # 生成参数不同的请求不共享缓存
+        params = (temperature, max_tokens)
+        query_embedding = self._embedder.embed_query(self._conversation_text(messages))
+        response = self._cache.get_chat(query_embedding, model, params=params)
+        if response is None:
+            response = self._llm.chat(messages, model, temperature, max_tokens)
+            self._cache.put_chat(query_embedding, response, model, params=params)
+        return response
+
+    async def chat_async(self,
+                         messages: List[ChatMessage],
+                         model: Optional[str] = None,
+                         temperature: float = 0.7,
+                         max_tokens: Optional[int] = None,
+                         **kwargs) -> ChatResponse:
+        # 带额外参数的请求不走缓存
+        if kwargs:
+            return await self._llm.chat_async(messages, model, temperature, max_tokens, **kwargs)
+
+        # 生成参数不同的请求不共享缓存
+        params = (temperature, max_tokens)
+        result = await self._embedder.embed_texts_async([self._conversation_text(messages)])
+        query_embedding = result.vectors[0]
+        response = self._cache.get_chat(query_embedding, model, params=params)
+        if response is None:
+            response = await self._llm.chat_async(messages, model, temperature, max_tokens)
+            self._cache.put_chat(query_embedding, response, model, params=params)
+        return response
+
+    def stream_chat(self,
+                    messages: List[ChatMessage],
+                    model: Optional[str] = None,
+                    temperature: float = 0.7,
+                    max_tokens: Optional[int] = None,
+                    **kwargs) -> Iterator[ChatResponse]:
+        # 流式输出不缓存
+        return self._llm.stream_chat(messages, model, temperature, max_tokens, **kwargs)
+
+    def stream_chat_async(self,
+                          messages: List[ChatMessage],
+                          model: Optional[str] = None,
+                          temperature: float = 0.7,
+                          max_tokens: Optional[int] = None,
+                          **kwargs) -> AsyncIterator[ChatResponse]:
+        return self._llm.stream_chat_async(messages, model, temperature, max_tokens, **kwargs)
+
+    def get_model_status(self, model: str) -> ModelStatus:
+        return self._llm.get_model_status(model)
+
+    async def validate_connection(self, timeout_s: float = 2.0) -> bool:
+        return await self._llm.validate_connection(timeout_s)
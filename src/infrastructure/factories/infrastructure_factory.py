@@ -3,7 +3,9 @@
 负责统一创建和配置所有基础设施组件
 """
 
-from typing import Optional, Type, TypeVar, Dict, Any
+import asyncio
+import sys
+from typing import Optional, Type, TypeVar, Dict, Any, Callable, List, Tuple
 from ..config.configuration_service import (
     IConfigurationService,
     ConfigurationService,
@@ -19,7 +21,9 @@ from ..di.container import (
     DependencyContainer,
     ServiceLifetime
 )
+from ..external.async_bridge import run_sync
 from ..external.interfaces import (
+    IConnectedService,
     ILLMService,
     IEmbeddingService,
     IVectorStoreService,
@@ -29,9 +33,22 @@ from ..external.interfaces import (
     IHealthCheckService,
     IMetricsService
 )
+from ..external.semantic_cache import (
+    ISemanticCache,
+    LSHSemanticCache,
+    SemanticCachedVectorStore,
+    SemanticCachedLLMService
+)
 
 T = TypeVar('T')
 
+# 生命周期 -> 容器注册方法名
+_REGISTERS: Dict[ServiceLifetime, str] = {
+    ServiceLifetime.SINGLETON: 'register_singleton',
+    ServiceLifetime.TRANSIENT: 'register_transient',
+    ServiceLifetime.SCOPED: 'register_scoped',
+}
+
 
 class InfrastructureFactory:
     """基础设施工厂类"""
@@ -42,6 +59,8 @@ class InfrastructureFactory:
         self._config_service: Optional[IConfigurationService] = None
         self._logging_service: Optional[ILoggingService] = None
         self._is_initialized = False
+        # 已执行 startup 的外部服务及其启动所在的事件循环（按启动顺序）
+        self._started_services: List[Tuple[IConnectedService, asyncio.AbstractEventLoop]] = []
 
     def initialize(self, environment: Optional[Environment] = None) -> None:
         """初始化基础设施
@@ -68,6 +87,17 @@ class InfrastructureFactory:
         self._validate_configuration()
 
         self._is_initialized = True
+
+        # 初始化完成后切换为跳过初始化检查的子类
+        if type(self) is InfrastructureFactory:
+            self.__class__ = _InitializedFactory
+
+        # 全局工厂初始化后，get_service 直接读取容器的单例表，快捷方法换为直接返回的版本
+        global _singletons
+        if self is _infrastructure_factory:
+            _singletons = self._container._singletons
+            _bind_fast_accessors(self)
+
         self._logging_service.info("基础设施初始化完成")
 
     def _register_core_services(self) -> None:
@@ -90,6 +120,12 @@ class InfrastructureFactory:
             self._container
         )
 
+        # 注册语义缓存（供带缓存的LLM/向量存储服务使用）
+        self._container.register_instance(
+            ISemanticCache,
+            LSHSemanticCache()
+        )
+
     def _validate_configuration(self) -> None:
         """验证配置"""
         validation_result = self._config_service.validate_configuration()
@@ -124,174 +160,171 @@ class InfrastructureFactory:
     def register_llm_service(self,
                             service_type: Type[ILLMService],
                             implementation_type: Type[ILLMService],
-                            lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
-        """注册LLM服务"""
-        if not self._is_initialized:
-            self.initialize()
+                            lifetime: ServiceLifetime = ServiceLifetime.SINGLETON,
+                            semantic_cache: bool = False) -> None:
+        """注册LLM服务
 
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册LLM服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        Args:
+            service_type: 服务类型
+            implementation_type: 实现类型
+            lifetime: 生命周期
+            semantic_cache: 是否在实现外包装语义缓存（需已注册嵌入服务）
+        """
+        factory = None
+        if semantic_cache:
+            factory = lambda: SemanticCachedLLMService(
+                self._container.resolve(implementation_type),
+                self._container.resolve(IEmbeddingService),
+                self._container.resolve(ISemanticCache)
+            )
+        self._register(service_type, implementation_type, lifetime, "LLM服务", factory)
 
     def register_embedding_service(self,
                                   service_type: Type[IEmbeddingService],
                                   implementation_type: Type[IEmbeddingService],
                                   lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册嵌入服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册嵌入服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "嵌入服务")
 
     def register_vector_store_service(self,
                                      service_type: Type[IVectorStoreService],
                                      implementation_type: Type[IVectorStoreService],
-                                     lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
-        """注册向量存储服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
+                                     lifetime: ServiceLifetime = ServiceLifetime.SINGLETON,
+                                     semantic_cache: bool = False) -> None:
+        """注册向量存储服务
 
-        self._logging_service.info(
-            f"已注册向量存储服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        Args:
+            service_type: 服务类型
+            implementation_type: 实现类型
+            lifetime: 生命周期
+            semantic_cache: 是否在实现外包装语义缓存
+        """
+        factory = None
+        if semantic_cache:
+            factory = lambda: SemanticCachedVectorStore(
+                self._container.resolve(implementation_type),
+                self._container.resolve(ISemanticCache)
+            )
+        self._register(service_type, implementation_type, lifetime, "向量存储服务", factory)
 
     def register_document_processor_service(self,
                                            service_type: Type[IDocumentProcessorService],
                                            implementation_type: Type[IDocumentProcessorService],
                                            lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册文档处理服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册文档处理服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "文档处理服务")
 
     def register_memory_service(self,
                                service_type: Type[IMemoryService],
                                implementation_type: Type[IMemoryService],
                                lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册内存服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册内存服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "内存服务")
 
     def register_rate_limiter_service(self,
                                      service_type: Type[IRateLimiterService],
                                      implementation_type: Type[IRateLimiterService],
                                      lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册限流服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册限流服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "限流服务")
 
     def register_health_check_service(self,
                                      service_type: Type[IHealthCheckService],
                                      implementation_type: Type[IHealthCheckService],
                                      lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册健康检查服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册健康检查服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "健康检查服务")
 
     def register_metrics_service(self,
                                 service_type: Type[IMetricsService],
                                 implementation_type: Type[IMetricsService],
                                 lifetime: ServiceLifetime = ServiceLifetime.SINGLETON) -> None:
         """注册指标服务"""
-        if not self._is_initialized:
-            self.initialize()
-
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
-        else:
-            self._container.register_scoped(service_type, implementation_type)
-
-        self._logging_service.info(
-            f"已注册指标服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
-        )
+        self._register(service_type, implementation_type, lifetime, "指标服务")
 
     def register_custom_service(self,
                                service_type: Type[T],
                                implementation_type: Type[T],
                                lifetime: ServiceLifetime = ServiceLifetime.TRANSIENT) -> None:
         """注册自定义服务"""
+        self._register(service_type, implementation_type, lifetime, "自定义服务")
+
+    def _register(self,
+                  service_type: Type,
+                  implementation_type: Type,
+                  lifetime: ServiceLifetime,
+                  label: str,
+                  factory: Optional[Callable[[], Any]] = None) -> None:
+        """注册服务（未初始化时先初始化）"""
         if not self._is_initialized:
             self.initialize()
+        self._register_service(service_type, implementation_type, lifetime, label, factory)
+
+    def _register_service(self,
+                          service_type: Type,
+                          implementation_type: Type,
+                          lifetime: ServiceLifetime,
+                          label: str,
+                          factory: Optional[Callable[[], Any]] = None) -> None:
+        """按生命周期注册服务
+
+        传入 factory 时，实现类型以自身为键按相同生命周期注册，
+        服务类型通过工厂方法解析实现并包装（用于语义缓存等装饰器）。
+        """
+        register = getattr(self._container, _REGISTERS[lifetime])
 
-        if lifetime == ServiceLifetime.SINGLETON:
-            self._container.register_singleton(service_type, implementation_type)
-        elif lifetime == ServiceLifetime.TRANSIENT:
-            self._container.register_transient(service_type, implementation_type)
+        if factory is not None:
+            register(implementation_type)
+            register(service_type, factory=factory)
         else:
-            self._container.register_scoped(service_type, implementation_type)
+            register(service_type, implementation_type)
 
         self._logging_service.info(
-            f"已注册自定义服务: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
+            f"已注册{label}: {service_type.__name__} -> {implementation_type.__name__} ({lifetime.value})"
         )
 
+    async def start_external_services(self) -> None:
+        """在当前事件循环中启动已注册的外部服务（LLM、嵌入、向量存储），建立可复用的连接池
+
+        服务创建的会话绑定到当前循环：只应在同一循环中 await 其异步方法。
+        同步应用（以及会调用同步方法 chat/embed_texts/stream_chat 的代码）应使用
+        start_external_services_sync()，使服务与同步桥接共用后台事件循环。
+        """
+        loop = asyncio.get_running_loop()
+        container = self.get_container()
+        for service_type in (ILLMService, IEmbeddingService, IVectorStoreService):
+            service = container.try_resolve(service_type)
+            if service is None or any(started is service for started, _ in self._started_services):
+                continue
+            await service.startup()
+            self._started_services.append((service, loop))
+            self._logging_service.info(f"外部服务已启动: {service_type.__name__}")
+
+    async def shutdown_external_services(self) -> None:
+        """关闭已启动的外部服务（按启动的逆序），每个服务在其启动所在的事件循环中关闭"""
+        current = asyncio.get_running_loop()
+        while self._started_services:
+            service, loop = self._started_services.pop()
+            try:
+                if loop is current:
+                    await service.shutdown()
+                elif loop.is_running():
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(service.shutdown(), loop))
+                else:
+                    self._logging_service.warning(
+                        f"外部服务启动所在的事件循环已停止，无法关闭: {type(service).__name__}"
+                    )
+            except Exception as e:
+                self._logging_service.error(f"关闭外部服务失败: {type(service).__name__}", exception=e)
+
+    def start_external_services_sync(self) -> None:
+        """在同步桥接的后台事件循环中启动外部服务（同步应用使用）"""
+        run_sync(self.start_external_services())
+
+    def shutdown_external_services_sync(self) -> None:
+        """在同步代码中关闭已启动的外部服务"""
+        run_sync(self.shutdown_external_services())
+
     def get_service_info(self) -> Dict[str, Any]:
         """获取服务注册信息"""
         if not self._is_initialized:
@@ -305,16 +338,56 @@ class InfrastructureFactory:
         }
 
     def reset(self) -> None:
-        """重置工厂（主要用于测试）"""
+        """重置工厂（主要用于测试）
+
+        异步应用应先 await shutdown_external_services()，这里仅兜底关闭仍在运行的外部服务
+        （各服务仍在其启动所在的事件循环中关闭）。
+        """
+        if self._started_services:
+            self.shutdown_external_services_sync()
+
+        global _singletons
+        if self._container is not None and _singletons is self._container._singletons:
+            _singletons = None
+            _restore_accessors()
+
         self._container = None
         self._config_service = None
         self._logging_service = None
         self._is_initialized = False
 
+        if type(self) is _InitializedFactory:
+            self.__class__ = InfrastructureFactory
+
+
+class _InitializedFactory(InfrastructureFactory):
+    """已初始化的基础设施工厂
+
+    InfrastructureFactory.initialize 完成后将实例的类切换为本类，
+    获取方法和注册方法不再检查初始化状态；reset 时切换回基类。
+    """
+
+    def get_container(self) -> IDependencyContainer:
+        """获取依赖注入容器"""
+        return self._container
+
+    def get_config_service(self) -> IConfigurationService:
+        """获取配置服务"""
+        return self._config_service
+
+    def get_logging_service(self) -> ILoggingService:
+        """获取日志服务"""
+        return self._logging_service
+
+    _register = InfrastructureFactory._register_service
+
 
 # 创建全局基础设施工厂单例
 _infrastructure_factory: Optional[InfrastructureFactory] = None
 
+# 全局工厂容器的单例表（初始化后设置），get_service 的快速路径
+_singletons: Optional[Dict[Type, Any]] = None
+
 
 def get_infrastructure_factory() -> InfrastructureFactory:
     """获取基础设施工厂单例"""
@@ -337,6 +410,13 @@ def initialize_infrastructure(environment: Optional[Environment] = None) -> None
 
 def get_service(service_type: Type[T]) -> T:
     """从基础设施工厂获取服务"""
+    # 快速路径：已创建的单例只需一次字典查找
+    singletons = _singletons
+    if singletons is not None:
+        instance = singletons.get(service_type)
+        if instance is not None:
+            return instance
+
     factory = get_infrastructure_factory()
     return factory.get_container().resolve(service_type)
 
@@ -353,4 +433,73 @@ def get_logger() -> ILoggingService:
 
 def get_container() -> IDependencyContainer:
     """获取依赖注入容器"""
-    return get_infrastructure_factory().get_container()
\ No newline at end of file
+    return get_infrastructure_factory().get_container()
+
+
+# 快捷方法的原始版本（未初始化时使用，reset 后恢复）
+_ORIGINAL_ACCESSORS: Dict[str, Callable] = {
+    'get_service': get_service,
+    'get_config': get_config,
+    'get_logger': get_logger,
+    'get_container': get_container,
+}
+
+
+def _bind_fast_accessors(factory: InfrastructureFactory) -> None:
+    """全局工厂初始化后，将快捷方法替换为直接返回已创建服务的闭包"""
+    config_service = factory._config_service
+    logging_service = factory._logging_service
+    container = factory._container
+    singletons = container._singletons
+    resolve = container.resolve
+
+    def fast_get_service(service_type: Type[T]) -> T:
+        """从基础设施工厂获取服务"""
+        instance = singletons.get(service_type)
+        if instance is not None:
+            return instance
+        return resolve(service_type)
+
+    def fast_get_config() -> IConfigurationService:
+        """获取配置服务"""
+        return config_service
+
+    def fast_get_logger() -> ILoggingService:
+        """获取日志服务"""
+        return logging_service
+
+    def fast_get_container() -> IDependencyContainer:
+        """获取依赖注入容器"""
+        return container
+
+    _replace_accessors({
+        'get_service': fast_get_service,
+        'get_config': fast_get_config,
+        'get_logger': fast_get_logger,
+        'get_container': fast_get_container,
+    })
+
+
+def _restore_accessors() -> None:
+    """恢复快捷方法的原始版本"""
+    _replace_accessors(_ORIGINAL_ACCESSORS)
+
+
+def _replace_accessors(accessors: Dict[str, Callable]) -> None:
+    """替换本模块及上层包中导出的快捷方法
+
+    包的 __init__ 可能以别名导出（如 get_di_container），因此按对象身份查找替换；
+    导入时已绑定到其他模块的引用不受影响，仍通过原始版本正常工作。
+    """
+    module = sys.modules[__name__]
+    replacements = {id(getattr(module, name)): accessor for name, accessor in accessors.items()}
+
+    package_name = __name__
+    while package_name:
+        package = sys.modules.get(package_name)
+        if package is not None:
+            for attr, value in list(vars(package).items()):
+                replacement = replacements.get(id(value))
+                if replacement is not None and callable(value):
+                    setattr(package, attr, replacement)
+        package_name = package_name.rpartition('.')[0]
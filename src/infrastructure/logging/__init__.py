@@ -5,6 +5,7 @@ from .logging_service import (
     LoggingService,
     LogLevel,
     PerformanceLogger,
+    PerformanceAggregator,
     performance_monitor,
     get_logging_service,
     create_logging_service
@@ -15,6 +16,7 @@ __all__ = [
     'LoggingService',
     'LogLevel',
     'PerformanceLogger',
+    'PerformanceAggregator',
     'performance_monitor',
     'get_logging_service',
     'create_logging_service'
@@ -5,14 +5,29 @@
 
 import os
 import sys
+import atexit
+import queue
 import logging
+import threading
 import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Union, List
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from enum import Enum
+from itertools import chain
+from time import perf_counter as _now
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 
 class LogLevel(Enum):
@@ -24,45 +39,100 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+# 日志级别 -> logging 数值级别
+_LEVEL_MAP: Dict[LogLevel, int] = {level: getattr(logging, level.value) for level in LogLevel}
+
+
 @dataclass
 class LogEntry:
-    """日志条目结构"""
-    timestamp: str
+    """日志条目结构
+
+    声明 __slots__ 以减小每条记录的对象开销（字段不设默认值，与同名 slot 兼容）；
+    取值为 None 的字段序列化时省略。
+    """
+    __slots__ = (
+        'timestamp', 'level', 'logger_name', 'message', 'module',
+        'function', 'line_number', 'extra_data', 'exception_info'
+    )
+
+    timestamp: datetime
     level: str
     logger_name: str
     message: str
-    module: Optional[str] = None
-    function: Optional[str] = None
-    line_number: Optional[int] = None
-    extra_data: Optional[Dict[str, Any]] = None
-    exception_info: Optional[str] = None
+    module: Optional[str]
+    function: Optional[str]
+    line_number: Optional[int]
+    extra_data: Optional[Dict[str, Any]]
+    exception_info: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（省略取值为 None 的字段）"""
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+
+# JSON 原生支持的标量类型
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _to_json_value(value: Any) -> Any:
+    """将值转换为JSON原生类型（时间输出为ISO格式，其余非原生类型转为字符串）"""
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    if isinstance(value, dict):
+        return _sanitize_extra(value)
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _sanitize_extra(extra: Dict[Any, Any]) -> Dict[str, Any]:
+    """预先转换额外数据中的非JSON类型，编码时无需 default 回调
+
+    额外数据通常只含标量，此时直接返回原字典，不复制。
+    """
+    for key, value in extra.items():
+        if type(key) is not str or not isinstance(value, _JSON_SCALARS):
+            break
+    else:
+        return extra
+    return {str(key): _to_json_value(value) for key, value in extra.items()}
 
 
 class ILoggingService(ABC):
-    """日志服务抽象接口"""
+    """日志服务抽象接口
+
+    消息可带 % 格式化参数，如 info("耗时 %.2f秒", elapsed)，级别未启用时不会格式化。
+    """
 
     @abstractmethod
-    def debug(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def debug(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录调试信息"""
         pass
 
     @abstractmethod
-    def info(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def info(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录信息"""
         pass
 
     @abstractmethod
-    def warning(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def warning(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录警告"""
         pass
 
     @abstractmethod
-    def error(self, message: str, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+    def error(self, message: str, *args: Any, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录错误"""
         pass
 
     @abstractmethod
-    def critical(self, message: str, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+    def critical(self, message: str, *args: Any, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录严重错误"""
         pass
 
@@ -75,30 +145,74 @@ class ILoggingService(ABC):
 class StructuredFormatter(logging.Formatter):
     """结构化日志格式化器"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 安装了 msgspec 时复用同一个编码器
+        self._msgspec_encode = msgspec.json.Encoder(enc_hook=str).encode if msgspec is not None else None
+        # 字段集合固定：预先生成各字段的键前缀（'{"timestamp":'、',"level":' ...），
+        # 未安装 orjson 时序列化只需编码取值，不再逐条构造和遍历字典
+        self._key_prefixes = tuple(
+            ('{' if index == 0 else ',') + json.dumps(entry_field.name) + ':'
+            for index, entry_field in enumerate(fields(LogEntry))
+        )
+        # 级别、日志器、模块、函数名取值有限，缓存其JSON编码
+        self._encoded_names: Dict[Optional[str], str] = {}
+        self._encode_str = json.JSONEncoder(ensure_ascii=False).encode
+        self._encode_any = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def _encode_name(self, value: Optional[str]) -> str:
+        """编码取值有限的字段（结果缓存）"""
+        encoded = self._encoded_names.get(value)
+        if encoded is None:
+            encoded = self._encoded_names[value] = self._encode_str(value)
+        return encoded
+
+    def _encode_entry(self, entry: LogEntry) -> str:
+        """按预生成的键前缀拼接JSON（取值顺序与 LogEntry 字段顺序一致）"""
+        encode_name = self._encode_name
+        encode_str = self._encode_str
+        values = (
+            '"' + entry.timestamp.isoformat() + '"',
+            encode_name(entry.level),
+            encode_name(entry.logger_name),
+            encode_str(entry.message),
+            None if entry.module is None else encode_name(entry.module),
+            None if entry.function is None else encode_name(entry.function),
+            None if entry.line_number is None else str(entry.line_number),
+            None if entry.extra_data is None else self._encode_any(entry.extra_data),
+            None if entry.exception_info is None else encode_str(entry.exception_info),
+        )
+        # 省略取值为 None 的字段；timestamp 总是存在，首个前缀中的 '{' 不会被省略
+        return ''.join(chain.from_iterable(
+            pair for pair in zip(self._key_prefixes, values) if pair[1] is not None
+        )) + '}'
+
     def format(self, record: logging.LogRecord) -> str:
         """格式化日志记录"""
         # 创建基础日志条目
         log_entry = LogEntry(
-            timestamp=datetime.fromtimestamp(record.created).isoformat(),
+            timestamp=datetime.fromtimestamp(record.created),
             level=record.levelname,
             logger_name=record.name,
             message=record.getMessage(),
             module=record.module,
             function=record.funcName,
             line_number=record.lineno,
+            # 额外数据：一次带默认值的属性查找，代替 hasattr 加再次取值
+            extra_data=getattr(record, 'extra_data', None),
+            # 异常信息
+            exception_info=self.formatException(record.exc_info) if record.exc_info else None,
         )
 
-        # 添加额外数据
-        if hasattr(record, 'extra_data'):
-            log_entry.extra_data = record.extra_data
-
-        # 添加异常信息
-        if record.exc_info:
-            log_entry.exception_info = self.formatException(record.exc_info)
-
-        # 转换为JSON格式
+        # 转换为JSON格式（依次优先 msgspec、orjson，时间输出为ISO格式；省略取值为 None 的字段）
         try:
-            return json.dumps(asdict(log_entry), ensure_ascii=False, default=str)
+            if self._msgspec_encode is not None:
+                return self._msgspec_encode(log_entry.to_dict()).decode('utf-8')
+            if orjson is not None:
+                return orjson.dumps(
+                    log_entry.to_dict(), option=orjson.OPT_NON_STR_KEYS, default=str
+                ).decode('utf-8')
+            return self._encode_entry(log_entry)
         except Exception:
             # 如果JSON序列化失败，使用普通格式
             return super().format(record)
@@ -112,19 +226,205 @@ class HumanReadableFormatter(logging.Formatter):
             fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
+        # 复用编码器：json.dumps 传入非默认参数时每次都会新建 JSONEncoder
+        self._encode_extra = json.JSONEncoder(ensure_ascii=False).encode
+        # (整秒时间戳, 格式化结果)；同一秒内的记录复用格式化好的时间
+        self._time_cache = (-1, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """格式化记录时间（时间格式只精确到秒，按秒缓存结果）"""
+        second = int(record.created)
+        cached_second, formatted = self._time_cache
+        if second != cached_second:
+            formatted = super().formatTime(record, datefmt)
+            # 整体替换元组，多线程下最坏只是重复格式化一次
+            self._time_cache = (second, formatted)
+        return formatted
 
     def format(self, record: logging.LogRecord) -> str:
         """格式化日志记录"""
         formatted = super().format(record)
 
         # 添加额外数据
-        if hasattr(record, 'extra_data') and record.extra_data:
-            extra_str = json.dumps(record.extra_data, ensure_ascii=False)
-            formatted += f" [EXTRA: {extra_str}]"
+        extra_data = getattr(record, 'extra_data', None)
+        if extra_data:
+            formatted = "%s [EXTRA: %s]" % (formatted, self._encode_extra(extra_data))
 
         return formatted
 
 
+# 单次 writev 的最大分段数
+_IOV_MAX = 1024
+
+
+def _write_all(fd: int, chunks: List[bytes]) -> None:
+    """将多段数据写入文件描述符
+
+    支持 writev 的平台上一次系统调用提交多段数据（分散/聚集写入），无需先拼接；
+    其余平台拼接后写入。处理部分写入的情况。
+    """
+    if hasattr(os, 'writev'):
+        for start in range(0, len(chunks), _IOV_MAX):
+            group = chunks[start:start + _IOV_MAX]
+            written = os.writev(fd, group)
+            expected = sum(map(len, group))
+            if written < expected:
+                _write_all(fd, [b''.join(group)[written:]])
+        return
+
+    data = memoryview(b''.join(chunks))
+    while data:
+        data = data[os.write(fd, data):]
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """缓冲写入的轮转文件处理器
+
+    记录在调用线程中格式化后放入无锁队列（多生产者），由单个后台线程批量取出并一次写入文件
+    （单消费者）。调用线程不获取处理器锁，也不等待磁盘写入，高并发下不再争用同一把锁。
+    文件轮转仍按 maxBytes/backupCount 进行，只在后台线程中执行。
+    flush() 向队列放入完成事件并等待后台线程写到该位置，写入始终只有一个消费者，记录不会乱序。
+    """
+
+    def __init__(self,
+                 filename: str,
+                 maxBytes: int = 0,
+                 backupCount: int = 0,
+                 encoding: Optional[str] = None,
+                 drain_interval: float = 0.1,
+                 buffer_bytes: int = 64 * 1024):
+        """初始化缓冲文件处理器
+
+        Args:
+            filename: 日志文件路径
+            maxBytes: 单个日志文件的最大字节数（0 表示不轮转）
+            backupCount: 备份文件数量
+            encoding: 文件编码
+            drain_interval: 后台线程空闲时检查关闭信号的间隔（秒）
+            buffer_bytes: 单次批量写入的最大字节数
+        """
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self._drain_interval = drain_interval
+        self._buffer_bytes = buffer_bytes
+        self._encoding = encoding or 'utf-8'
+        # 队列元素为编码后的记录，或 flush() 放入的完成事件
+        self._queue: 'queue.SimpleQueue[Union[bytes, threading.Event]]' = queue.SimpleQueue()
+        # 当前文件已写入的字节数（None 表示需要按文件实际大小重新计数）
+        self._bytes_written: Optional[int] = None
+        # 写文件专用锁：logging.shutdown 会持有处理器锁调用 flush()，后台线程写入时不能依赖处理器锁
+        self._write_lock = threading.RLock()
+        self._closing = threading.Event()
+        self._drain_thread = threading.Thread(
+            target=self._drain_loop,
+            name="log-drain",
+            daemon=True
+        )
+        self._drain_thread.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """过滤并入队记录（不获取处理器锁）"""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """在调用线程中格式化并编码记录，放入写入队列"""
+        try:
+            self._queue.put((self.format(record) + self.terminator).encode(self._encoding))
+        except Exception:
+            self.handleError(record)
+
+    def _drain_loop(self) -> None:
+        """后台写入循环：阻塞等待记录，再一次取出队列中已积累的记录批量写入"""
+        while not self._closing.is_set():
+            try:
+                first = self._queue.get(timeout=self._drain_interval)
+            except queue.Empty:
+                continue
+            try:
+                self._write_batch(first)
+            except Exception:
+                # 写入失败（如磁盘已满）时丢弃本批，不终止后台线程
+                pass
+
+    def _write_batch(self, first: Union[bytes, threading.Event] = b'') -> bool:
+        """取出队列中的记录写入文件，返回是否还有剩余记录（只能由唯一的消费者调用）"""
+        batch = []
+        waiters = []
+        size = 0
+        message = first
+        while True:
+            if isinstance(message, bytes):
+                batch.append(message)
+                size += len(message)
+            else:
+                waiters.append(message)
+            if size >= self._buffer_bytes:
+                break
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+        try:
+            self._write(batch, size)
+        finally:
+            # 本批之前的记录均已写入，唤醒等待的 flush()
+            for waiter in waiters:
+                waiter.set()
+        return size >= self._buffer_bytes
+
+    def _write(self, batch: List[bytes], size: int) -> None:
+        """将一批记录写入文件，必要时先轮转"""
+        if not size:
+            return
+        with self._write_lock:
+            if self.stream is None:
+                self.stream = self._open()
+            fd = self.stream.fileno()
+            if self.maxBytes > 0:
+                # 按内存中的计数判断是否轮转，只在打开或轮转后查询一次文件大小
+                if self._bytes_written is None:
+                    self._bytes_written = os.fstat(fd).st_size
+                if self._bytes_written + size >= self.maxBytes:
+                    self.doRollover()
+                    fd = self.stream.fileno()
+            _write_all(fd, batch)
+            if self._bytes_written is not None:
+                self._bytes_written += size
+
+    def doRollover(self) -> None:
+        """轮转日志文件，并在下次写入时重新计数"""
+        super().doRollover()
+        self._bytes_written = None
+
+    def flush(self) -> None:
+        """等待队列中已有的记录全部写入"""
+        thread = self._drain_thread
+        if thread is not threading.current_thread() and thread.is_alive():
+            # 交给后台线程按顺序写入，等待其写到完成事件所在位置
+            done = threading.Event()
+            self._queue.put(done)
+            while not done.wait(self._drain_interval):
+                if not thread.is_alive():
+                    break
+        if thread is threading.current_thread() or not thread.is_alive():
+            # 后台线程自身调用或已退出时由当前线程写入剩余记录
+            with self._write_lock:
+                while self._write_batch():
+                    pass
+        super().flush()
+
+    def close(self) -> None:
+        """停止后台线程，写入剩余记录后关闭文件"""
+        self._closing.set()
+        if self._drain_thread is not threading.current_thread():
+            self._drain_thread.join(timeout=self._drain_interval * 10)
+        self.flush()
+        super().close()
+
+
 class LoggingService(ILoggingService):
     """日志服务实现类"""
 
@@ -152,7 +452,7 @@ class LoggingService(ILoggingService):
 
         # 创建日志器
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, level.value))
+        self.logger.setLevel(_LEVEL_MAP[level])
 
         # 清除现有处理器
         self.logger.handlers.clear()
@@ -175,8 +475,8 @@ class LoggingService(ILoggingService):
                 # 确保日志目录存在
                 os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
 
-                # 创建轮转文件处理器
-                file_handler = RotatingFileHandler(
+                # 创建轮转文件处理器（后台线程批量写入）
+                file_handler = BufferedRotatingFileHandler(
                     log_file_path,
                     maxBytes=max_file_size_mb * 1024 * 1024,
                     backupCount=backup_count,
@@ -189,42 +489,45 @@ class LoggingService(ILoggingService):
                 # 如果文件处理器创建失败，记录到控制台
                 self.logger.error(f"无法创建日志文件处理器: {e}")
 
-    def _log_with_extra(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None, exception: Optional[Exception] = None) -> None:
-        """内部日志方法，支持额外数据"""
-        if extra:
-            # 创建额外的记录属性
-            extra_record = {'extra_data': extra}
-        else:
-            extra_record = {}
-
-        if exception:
-            self.logger.log(level, message, exc_info=exception, extra=extra_record)
-        else:
-            self.logger.log(level, message, extra=extra_record)
+    def _log_with_extra(self, level: int, message: str, args: tuple, extra: Optional[Dict[str, Any]] = None, exception: Optional[Exception] = None) -> None:
+        """内部日志方法，支持额外数据（args 由 logging 在级别通过后按 % 格式化）"""
+        logger = self.logger
+        # 级别未启用时直接返回，不构造 extra 字典和调用参数
+        if not logger.isEnabledFor(level):
+            return
+
+        # 单一调用路径：exc_info/extra 为 None 时 logging 直接跳过对应处理，无需分支和空字典
+        logger.log(
+            level,
+            message,
+            *args,
+            exc_info=exception,
+            extra={'extra_data': _sanitize_extra(extra)} if extra else None
+        )
 
-    def debug(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def debug(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录调试信息"""
-        self._log_with_extra(logging.DEBUG, message, extra)
+        self._log_with_extra(logging.DEBUG, message, args, extra)
 
-    def info(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def info(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录信息"""
-        self._log_with_extra(logging.INFO, message, extra)
+        self._log_with_extra(logging.INFO, message, args, extra)
 
-    def warning(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    def warning(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录警告"""
-        self._log_with_extra(logging.WARNING, message, extra)
+        self._log_with_extra(logging.WARNING, message, args, extra)
 
-    def error(self, message: str, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+    def error(self, message: str, *args: Any, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录错误"""
-        self._log_with_extra(logging.ERROR, message, extra, exception)
+        self._log_with_extra(logging.ERROR, message, args, extra, exception)
 
-    def critical(self, message: str, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+    def critical(self, message: str, *args: Any, exception: Optional[Exception] = None, extra: Optional[Dict[str, Any]] = None) -> None:
         """记录严重错误"""
-        self._log_with_extra(logging.CRITICAL, message, extra, exception)
+        self._log_with_extra(logging.CRITICAL, message, args, extra, exception)
 
     def set_level(self, level: LogLevel) -> None:
         """设置日志级别"""
-        self.logger.setLevel(getattr(logging, level.value))
+        self.logger.setLevel(_LEVEL_MAP[level])
 
     def get_logger(self) -> logging.Logger:
         """获取底层的logging.Logger实例"""
@@ -259,12 +562,12 @@ class PerformanceLogger:
 
         if execution_time > 5.0:  # 超过5秒记录为警告
             self.logging_service.warning(
-                f"函数 {func_name} 执行时间较长: {execution_time:.2f}秒",
+                "函数 %s 执行时间较长: %.2f秒", func_name, execution_time,
                 extra=extra_data
             )
         else:
             self.logging_service.info(
-                f"函数 {func_name} 执行完成: {execution_time:.2f}秒",
+                "函数 %s 执行完成: %.2f秒", func_name, execution_time,
                 extra=extra_data
             )
 
@@ -289,56 +592,203 @@ class PerformanceLogger:
 
         if status_code >= 400:
             self.logging_service.error(
-                f"API请求失败: {method} {url} - {status_code}",
+                "API请求失败: %s %s - %s", method, url, status_code,
                 extra=extra_data
             )
         elif response_time > 10.0:  # 超过10秒记录为警告
             self.logging_service.warning(
-                f"API请求响应慢: {method} {url} - {response_time:.2f}秒",
+                "API请求响应慢: %s %s - %.2f秒", method, url, response_time,
                 extra=extra_data
             )
         else:
             self.logging_service.info(
-                f"API请求成功: {method} {url} - {response_time:.2f}秒",
+                "API请求成功: %s %s - %.2f秒", method, url, response_time,
                 extra=extra_data
             )
 
 
+# 超过该耗时（秒）的调用立即单独记录，不等待汇总
+_SLOW_CALL_SECONDS = 5.0
+
+
+class PerformanceAggregator:
+    """函数性能汇总器
+
+    被监控函数每次调用只更新当前线程的汇总桶（调用次数、总耗时、最长耗时、失败次数），
+    后台线程每隔 interval 秒合并各线程的数据，每个函数输出一条汇总日志，
+    避免高频函数每次调用都经过完整的日志管道。
+    """
+
+    def __init__(self, logging_service: ILoggingService, interval: float = 5.0):
+        """初始化性能汇总器
+
+        Args:
+            logging_service: 输出汇总日志的日志服务
+            interval: 汇总输出间隔（秒）
+        """
+        self._logging_service = logging_service
+        self._interval = interval
+        self._local = threading.local()
+        # [线程锁, 线程汇总字典, 所属线程] 列表；线程锁只在后台合并时才可能发生争用，
+        # 所属线程结束后由合并时清理
+        self._thread_stats: List[List[Any]] = []
+        self._thread_stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+
+    def _stats(self) -> List[Any]:
+        """获取当前线程的汇总桶，首次使用时创建并启动后台线程"""
+        stats = getattr(self._local, 'stats', None)
+        if stats is None:
+            stats = self._local.stats = [threading.Lock(), {}, threading.current_thread()]
+            with self._thread_stats_lock:
+                self._thread_stats.append(stats)
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(
+                        target=self._flush_loop,
+                        name="performance-aggregator",
+                        daemon=True
+                    )
+                    self._flush_thread.start()
+        return stats
+
+    def record(self, func_name: str, execution_time: float, success: bool = True) -> None:
+        """记录一次函数调用
+
+        Args:
+            func_name: 函数名称
+            execution_time: 执行时间（秒）
+            success: 是否执行成功
+        """
+        stats = self._stats()
+        with stats[0]:
+            # 在锁内取汇总字典：合并时会整体换出
+            buckets = stats[1]
+            bucket = buckets.get(func_name)
+            if bucket is None:
+                bucket = buckets[func_name] = [0, 0.0, 0.0, 0]
+            bucket[0] += 1
+            bucket[1] += execution_time
+            if execution_time > bucket[2]:
+                bucket[2] = execution_time
+            if not success:
+                bucket[3] += 1
+
+    def flush(self) -> None:
+        """合并各线程的汇总数据，每个函数输出一条汇总日志"""
+        with self._thread_stats_lock:
+            thread_stats = list(self._thread_stats)
+
+        merged: Dict[str, List[Any]] = {}
+        finished = []
+        for stats in thread_stats:
+            # 先判断线程是否已结束：已结束的线程不会再写入，合并后即可丢弃其汇总桶
+            if not stats[2].is_alive():
+                finished.append(stats)
+            with stats[0]:
+                buckets, stats[1] = stats[1], {}
+            for func_name, (count, total, longest, failures) in buckets.items():
+                bucket = merged.get(func_name)
+                if bucket is None:
+                    merged[func_name] = [count, total, longest, failures]
+                else:
+                    bucket[0] += count
+                    bucket[1] += total
+                    bucket[2] = max(bucket[2], longest)
+                    bucket[3] += failures
+
+        if finished:
+            finished_ids = {id(stats) for stats in finished}
+            with self._thread_stats_lock:
+                self._thread_stats = [
+                    stats for stats in self._thread_stats if id(stats) not in finished_ids
+                ]
+
+        for func_name, (count, total, longest, failures) in merged.items():
+            self._logging_service.info(
+                "函数 %s 性能汇总: %d次调用, 平均%.3f秒, 最长%.3f秒, 失败%d次",
+                func_name, count, total / count, longest, failures,
+                extra={
+                    "performance_metric": True,
+                    "function_name": func_name,
+                    "call_count": count,
+                    "total_time_seconds": total,
+                    "avg_time_seconds": total / count,
+                    "max_time_seconds": longest,
+                    "failure_count": failures,
+                    "interval_seconds": self._interval
+                }
+            )
+
+    def _flush_loop(self) -> None:
+        """后台汇总循环"""
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:
+                # 汇总输出失败不影响被监控函数
+                pass
+
+    def close(self) -> None:
+        """停止后台线程并输出剩余汇总"""
+        self._stop_event.set()
+        self.flush()
+
+
+# 日志服务 -> 性能汇总器（同一日志服务的所有被装饰函数共用一个后台线程）
+_performance_aggregators: Dict[int, PerformanceAggregator] = {}
+_performance_aggregators_lock = threading.Lock()
+
+
+def get_performance_aggregator(logging_service: ILoggingService) -> PerformanceAggregator:
+    """获取日志服务对应的性能汇总器"""
+    key = id(logging_service)
+    aggregator = _performance_aggregators.get(key)
+    if aggregator is None:
+        with _performance_aggregators_lock:
+            aggregator = _performance_aggregators.get(key)
+            if aggregator is None:
+                aggregator = _performance_aggregators[key] = PerformanceAggregator(logging_service)
+    return aggregator
+
+
 def performance_monitor(logging_service: ILoggingService):
-    """性能监控装饰器"""
+    """性能监控装饰器
+
+    调用耗时汇总后定期输出；超过 5 秒的慢调用和失败调用仍立即记录。
+    """
     def decorator(func):
+        # 每个被装饰函数共用一个性能日志器和汇总器
+        performance_logger = PerformanceLogger(logging_service)
+        aggregator = get_performance_aggregator(logging_service)
+        func_name = func.__name__
+
         def wrapper(*args, **kwargs):
-            import time
-            start_time = time.time()
+            start_time = _now()
 
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = _now() - start_time
 
-                performance_logger = PerformanceLogger(logging_service)
-                performance_logger.log_function_performance(
-                    func_name=func.__name__,
-                    execution_time=execution_time,
-                    success=True
-                )
+                aggregator.record(func_name, execution_time)
+                if execution_time > _SLOW_CALL_SECONDS:
+                    performance_logger.log_function_performance(
+                        func_name=func_name,
+                        execution_time=execution_time,
+                        success=True
+                    )
 
                 return result
 
             except Exception as e:
-                execution_time = time.time() - start_time
-
-                performance_logger = PerformanceLogger(logging_service)
-                performance_logger.log_function_performance(
-                    func_name=func.__name__,
-                    execution_time=execution_time,
-                    success=False,
-                    error=str(e)
-                )
+                execution_time = _now() - start_time
 
+                aggregator.record(func_name, execution_time, success=False)
                 logging_service.error(
-                    f"函数 {func.__name__} 执行失败",
+                    f"函数 {func_name} 执行失败",
                     exception=e,
-                    extra={"execution_time": execution_time}
+                    extra={"execution_time": execution_time, "error": str(e)}
                 )
 
                 raise
@@ -349,13 +799,19 @@ def performance_monitor(logging_service: ILoggingService):
 
 # 创建全局日志服务单例
 _logging_service: Optional[LoggingService] = None
+_logging_service_lock = threading.Lock()
 
 
 def get_logging_service() -> LoggingService:
     """获取日志服务单例"""
     global _logging_service
+
     if _logging_service is None:
-        _logging_service = create_default_logging_service()
+        with _logging_service_lock:
+            # 并发初始化时只创建一个实例，避免重复安装文件处理器
+            if _logging_service is None:
+                _logging_service = create_default_logging_service()
+
     return _logging_service
 
 
@@ -5,6 +5,7 @@
 
 from .metrics_service import (
     MetricsService,
+    BufferedMetricsService,
     MetricType,
     MetricValue,
     TimeSeriesData,
@@ -35,6 +36,7 @@ from .monitoring_middleware import (
 __all__ = [
     # Metrics Service
     'MetricsService',
+    'BufferedMetricsService',
     'MetricType',
     'MetricValue',
     'TimeSeriesData',
@@ -3,11 +3,12 @@
 提供实时指标收集、存储和查询功能
 """
 
+import atexit
 import time
 import threading
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterable
 from enum import Enum
 from collections import defaultdict, deque
 import json
@@ -183,6 +184,22 @@ class MetricsService(IMetricsService):
             except Exception as e:
                 self._logger.error(f"记录直方图失败: {name}", exception=e)
 
+    def bulk_emit(self,
+                  samples: Iterable[Tuple[str, str, float, Optional[Dict[str, str]]]]) -> None:
+        """批量记录指标，整批只获取一次锁
+
+        Args:
+            samples: (类型, 名称, 数值, 标签) 元组序列，类型为 counter/gauge/histogram
+        """
+        with self._lock:
+            for kind, name, value, tags in samples:
+                if kind == 'counter':
+                    self.increment_counter(name, tags)
+                elif kind == 'histogram':
+                    self.record_histogram(name, value, tags)
+                else:
+                    self.record_metric(name, value, tags)
+
     def get_metrics(self,
                    name_pattern: Optional[str] = None) -> Dict[str, Any]:
         """获取指标数据
@@ -396,6 +413,123 @@ class MetricsService(IMetricsService):
                 self._logger.error("清理指标数据失败", exception=e)
 
 
+class BufferedMetricsService(IMetricsService):
+    """缓冲指标服务
+
+    记录指标只向当前线程的 deque 追加一条样本，不获取任何锁；
+    后台线程每隔 flush_interval 秒取出全部线程缓冲的样本，通过 bulk_emit 一次性提交给
+    下游指标服务（默认全局 MetricsService）。缓冲满时丢弃最旧的样本，不阻塞调用方。
+    """
+
+    def __init__(self,
+                 sink: Optional[MetricsService] = None,
+                 flush_interval: float = 0.1,
+                 buffer_size: int = 8192):
+        """初始化缓冲指标服务
+
+        Args:
+            sink: 实际存储指标的服务，需提供 bulk_emit
+            flush_interval: 后台提交间隔（秒）
+            buffer_size: 每个线程缓冲的最大样本数
+        """
+        self._sink = sink or get_metrics_service()
+        self._flush_interval = flush_interval
+        self._buffer_size = buffer_size
+        self._local = threading.local()
+        # (所属线程, 缓冲区) 列表，所属线程结束后由提交时清理
+        self._buffers: List[Tuple[threading.Thread, deque]] = []
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    def _buffer(self) -> deque:
+        """获取当前线程的缓冲区，首次使用时创建并启动后台提交线程"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = deque(maxlen=self._buffer_size)
+            with self._buffers_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(
+                        target=self._flush_loop,
+                        name="metrics-flush",
+                        daemon=True
+                    )
+                    self._flush_thread.start()
+        return buffer
+
+    def record_metric(self,
+                     name: str,
+                     value: float,
+                     tags: Optional[Dict[str, str]] = None) -> None:
+        """记录指标"""
+        self._buffer().append(('gauge', name, value, tags))
+
+    def increment_counter(self,
+                         name: str,
+                         tags: Optional[Dict[str, str]] = None) -> None:
+        """递增计数器"""
+        self._buffer().append(('counter', name, 1.0, tags))
+
+    def record_histogram(self,
+                        name: str,
+                        value: float,
+                        tags: Optional[Dict[str, str]] = None) -> None:
+        """记录直方图"""
+        self._buffer().append(('histogram', name, value, tags))
+
+    def get_metrics(self,
+                   name_pattern: Optional[str] = None) -> Dict[str, Any]:
+        """获取指标数据（先提交已缓冲的样本）"""
+        self.flush()
+        return self._sink.get_metrics(name_pattern)
+
+    def flush(self) -> None:
+        """将所有线程缓冲的样本提交给下游指标服务，并清理已结束线程的缓冲区"""
+        # 取出与提交都在提交锁内，并发提交时样本按取出顺序提交
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+
+            samples = []
+            finished = []
+            for thread, buffer in buffers:
+                # 先判断线程是否已结束：已结束的线程不会再写入，取空后即可丢弃
+                if not thread.is_alive():
+                    finished.append(buffer)
+                # deque 的 append/popleft 是线程安全的，记录线程无需停顿
+                for _ in range(len(buffer)):
+                    samples.append(buffer.popleft())
+
+            if samples:
+                self._sink.bulk_emit(samples)
+
+            if finished:
+                finished_ids = {id(buffer) for buffer in finished}
+                with self._buffers_lock:
+                    self._buffers = [
+                        entry for entry in self._buffers if id(entry[1]) not in finished_ids
+                    ]
+
+    def _flush_loop(self) -> None:
+        """后台提交循环"""
+        while not self._stop_event.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                get_logging_service().error("提交缓冲指标失败", exception=e)
+
+    def close(self) -> None:
+        """停止后台提交线程并提交剩余样本"""
+        self._stop_event.set()
+        thread = self._flush_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self._flush_interval * 10)
+        self.flush()
+
+
 # 全局实例
 _metrics_service_instance: Optional[MetricsService] = None
 _metrics_service_lock = threading.Lock()
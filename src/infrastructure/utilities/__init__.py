@@ -9,10 +9,12 @@ from .utility_service import (
     ProgressTracker,
     get_utility_service
 )
+from .dataclass_slots import add_slots
 
 __all__ = [
     "IUtilityService",
     "UtilityService",
     "ProgressTracker",
-    "get_utility_service"
+    "get_utility_service",
+    "add_slots"
 ]
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+数据类 __slots__ 支持
+运行环境为 Python 3.9，dataclass 尚不支持 slots=True，这里提供等价的类装饰器
+"""
+
+from dataclasses import fields
+from typing import Type, TypeVar
+
+
+T = TypeVar('T')
+
+
+def add_slots(cls: Type[T]) -> Type[T]:
+    """为数据类重建带 __slots__ 的同名类（等价于 Python 3.10 的 dataclass(slots=True)）
+
+    字段默认值已在 dataclass 生成的 __init__ 中捕获，可从类属性中移除，
+    从而避免与同名 slot 冲突。需放在 @dataclass 之上使用。
+
+    Args:
+        cls: 已经过 @dataclass 处理的类
+
+    Returns:
+        带 __slots__ 的新类
+    """
+    if '__slots__' in cls.__dict__:
+        raise TypeError(f"{cls.__name__} 已定义 __slots__")
+
+    # 父类已声明的 slot 不再重复声明
+    inherited_slots = set()
+    for base in cls.__mro__[1:-1]:
+        inherited_slots.update(getattr(base, '__slots__', ()))
+
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = tuple(name for name in field_names if name not in inherited_slots)
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    # 冻结实例不能直接赋值，序列化时需绕过 __setattr__
+    if cls.__dataclass_params__.frozen:
+        cls_dict['__getstate__'] = _dataclass_getstate
+        cls_dict['__setstate__'] = _dataclass_setstate
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def _dataclass_getstate(self) -> list:
+    return [getattr(self, f.name) for f in fields(self)]
+
+
+def _dataclass_setstate(self, state: list) -> None:
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)